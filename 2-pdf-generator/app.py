@@ -1,60 +1,66 @@
+import argparse
+import io
 import json
 import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
 
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
+from layout import (
+    BODY_FONT,
+    LINE_HEIGHT,
+    PAGE_HEIGHT,
+    PAGE_WIDTH,
+    SECTION_WIDTH,
+    SECTION_X,
+    TEXT_INDENT,
+    TEXT_OFFSET,
+    TITLE_FONT,
+    TITLE_OFFSET,
+    paginate,
+)
+from manifest import ReportManifest
 
-def generate_pdf(data, output_file):
-    c = canvas.Canvas(output_file, pagesize=letter)
-    page_width, page_height = letter
 
-    # Minimal color palette
-    PRIMARY = colors.HexColor("#2d4059")
-    SECONDARY = colors.HexColor("#f5f5f5")
+# Keep compressed content streams binary instead of ASCII85-encoding them:
+# the encoding costs CPU time on every report and inflates streams by 25%
+rl_config.useA85 = 0
 
+# Bump when report output changes, so incremental runs re-render everything
+RENDERER_VERSION = "1"
+
+# Minimal color palette
+PRIMARY = colors.HexColor("#2d4059")
+SECONDARY = colors.HexColor("#f5f5f5")
+
+
+def draw_page_chrome(c):
+    """Draw the static parts of a page: background and header bar."""
     # Clean background
     c.setFillColor(colors.white)
-    c.rect(0, 0, page_width, page_height, fill=1)
+    c.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, fill=1)
 
     # Header Section
     c.setFillColor(PRIMARY)
-    c.rect(0, page_height - 60, page_width, 60, fill=1)
-    c.setFillColor(colors.white)
-    c.setFont("Helvetica-Bold", 18)
-    c.drawCentredString(
-        page_width / 2, page_height - 45, f"{data['name']} - Professional Report"
-    )
-
-    # Section parameters
-    section_x = 40
-    section_width = page_width - 80
-    current_y = page_height - 100
+    c.rect(0, PAGE_HEIGHT - 60, PAGE_WIDTH, 60, fill=1)
 
-    def draw_section(title, content_lines, section_height):
-        nonlocal current_y
-        # Section container
-        c.setStrokeColor(colors.lightgrey)
-        c.setFillColor(SECONDARY)
-        c.rect(
-            section_x, current_y - section_height, section_width, section_height, fill=1
-        )
-
-        # Section title
-        c.setFillColor(PRIMARY)
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(section_x + 10, current_y - 25, title)
 
-        # Content
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica", 10)
-        text = c.beginText(section_x + 20, current_y - 50)
-        for line in content_lines:
-            text.textLine(line)
-        c.drawText(text)
+def build_report(data):
+    """Collect a report's title and lay its sections out onto pages.
 
-        current_y -= section_height + 30
+    All record fields are read here, before anything is drawn, so a record
+    with missing fields fails without leaving a half-drawn page behind.
+    """
+    title = f"{data['name']} - Professional Report"
 
     # Personal Information
     personal_info = [
@@ -63,18 +69,15 @@ def generate_pdf(data, output_file):
         f"Position: {data['job']}",
         f"Salary: {data['salary']}",
     ]
-    draw_section("Personal Information", personal_info, 100)
 
     # Contact Information
     contact_info = [data["contact"]["email"], data["contact"]["phone"]]
-    draw_section("Contact Information", contact_info, 80)
 
     # Education
     education = [
         f"{edu['degree']} in {edu['field']} - {edu['university']} ({edu['year']})"
         for edu in data["education"]
     ]
-    draw_section("Education", education, (40 + 20 * len(data["education"])))
 
     # Work Experience
     work_experience = []
@@ -87,28 +90,455 @@ def generate_pdf(data, output_file):
                 "",  # Add spacing between entries
             ]
         )
-    draw_section("Work Experience", work_experience, (40 + 20 * len(work_experience)))
 
-    c.showPage()
+    sections = [
+        ("Personal Information", personal_info),
+        ("Contact Information", contact_info),
+        ("Education", education),
+        ("Work Experience", work_experience),
+    ]
+    return title, paginate(sections)
+
+
+def draw_report(c, report):
+    """Draw a report from ``build_report`` onto new pages of ``c``."""
+    title, pages = report
+    for boxes in pages:
+        draw_page_chrome(c)
+
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 18)
+        c.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 45, title)
+
+        c.setStrokeColor(colors.lightgrey)
+        for section_title, lines, top, height in boxes:
+            # Section container
+            c.setFillColor(SECONDARY)
+            c.rect(SECTION_X, top - height, SECTION_WIDTH, height, fill=1)
+
+            # Section title
+            c.setFillColor(PRIMARY)
+            c.setFont(*TITLE_FONT)
+            c.drawString(SECTION_X + 10, top - TITLE_OFFSET, section_title)
+
+            # Content
+            c.setFillColor(colors.black)
+            c.setFont(*BODY_FONT, leading=LINE_HEIGHT)
+            text = c.beginText(SECTION_X + TEXT_INDENT, top - TEXT_OFFSET)
+            for line in lines:
+                text.textLine(line)
+            c.drawText(text)
+
+        c.showPage()
+
+
+def generate_pdf(data, output_file, compress=True):
+    """Render one report to ``output_file`` (a path or binary file object).
+
+    ``compress`` deflates the page content, trading CPU time for size.
+    """
+    report = build_report(data)
+    c = canvas.Canvas(output_file, pagesize=letter, pageCompression=int(compress))
+    draw_report(c, report)
     c.save()
 
 
+def render_pdf_bytes(data, compress=True):
+    """Render one report in memory and return the PDF bytes."""
+    buffer = io.BytesIO()
+    generate_pdf(data, buffer, compress)
+    return buffer.getvalue()
+
+
+# Characters that may follow a complete item of a JSON array
+JSON_DELIMITERS = frozenset(",] \t\r\n")
+
+
 def load_data(filename):
     with open(filename, "r") as file:
         return json.load(file)
 
 
-def main():
-    # Load demo data
-    data = load_data("data/report_data.json")
+def iter_json_array(file, chunk_size=64 * 1024):
+    """Yield the items of a top-level JSON array without loading it whole.
+
+    The file is read in ``chunk_size`` pieces and each item is decoded as
+    soon as it is complete, so memory use is bounded by the largest item.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    # Next token: the opening "[", the first item or "]", an item after a
+    # comma, a "," or "]" after an item, then only whitespace
+    expect = "open"
+
+    while True:
+        buffer = buffer.lstrip()
+        if buffer:
+            char = buffer[0]
+            if expect == "open":
+                if char != "[":
+                    raise ValueError("Expected a top-level JSON array")
+                buffer = buffer[1:]
+                expect = "first"
+                continue
+            if expect == "done":
+                raise ValueError("Unexpected data after the JSON array")
+            if expect == "separator":
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                buffer = buffer[1:]
+                expect = "item" if char == "," else "done"
+                continue
+            if char == "]" and expect == "first":
+                buffer = buffer[1:]
+                expect = "done"
+                continue
+            if char in ",]":
+                raise ValueError(f"Expected a JSON array item, got {char!r}")
+
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Only a delimiter or the end of input completes an item, as
+                # "1" at the end of a chunk may continue as "1.5"
+                if eof or (end < len(buffer) and buffer[end] in JSON_DELIMITERS):
+                    yield item
+                    buffer = buffer[end:]
+                    expect = "separator"
+                    continue
+                # Anything else is invalid once the item can't grow any more
+                if not JSON_DELIMITERS.isdisjoint(buffer[end:]):
+                    raise ValueError(f"Invalid JSON array item: {buffer[:end + 1]!r}")
+
+        if eof:
+            if expect == "done":
+                return
+            raise ValueError("Unexpected end of JSON input")
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def iter_ndjson(file):
+    """Yield one record per non-empty line of newline-delimited JSON."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(filename, input_format="auto"):
+    """Stream records from a JSON array or NDJSON file (``-`` for stdin)."""
+    if input_format == "auto":
+        is_ndjson = filename.endswith((".ndjson", ".jsonl"))
+        input_format = "ndjson" if is_ndjson else "json"
+    reader = iter_ndjson if input_format == "ndjson" else iter_json_array
+
+    if filename == "-":
+        yield from reader(sys.stdin)
+        return
+    with open(filename, "r") as file:
+        yield from reader(file)
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def report_filename(index):
+    return f"report_{index + 1}.pdf"
+
+
+def numbered_tasks(records):
+    """Pair records with report filenames numbered by input position."""
+    for index, person in enumerate(records):
+        yield report_filename(index), person
+
+
+def render_chunk(tasks, output_dir=None, compress=True):
+    """Render a chunk of ``(filename, person)`` tasks.
+
+    Reports are written to ``output_dir`` and their paths returned, or with
+    no ``output_dir`` their PDF bytes are returned for the caller to write.
+    Errors are caught per record and returned, so one bad record doesn't
+    take down the worker or the rest of its chunk.
+    """
+    results = []
+    for filename, person in tasks:
+        name = person.get("name", filename)
+        try:
+            if output_dir is None:
+                output = render_pdf_bytes(person, compress)
+            else:
+                output = os.path.join(output_dir, filename)
+                generate_pdf(person, output, compress)
+            results.append((filename, name, output, None))
+        except Exception as e:
+            results.append((filename, name, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def render_document(records, output_file, compress=True):
+    """Render every record as pages of one PDF with an outline entry each.
 
-    # Generate PDF for each person in the data
-    os.makedirs("generated_pdfs", exist_ok=True)
-    for i, person in enumerate(data):
-        output_file = f"generated_pdfs/report_{i + 1}.pdf"
-        generate_pdf(person, output_file)
-        print(f"Generated PDF for {person['name']} saved as {output_file}")
+    Yields a single-item result list per record, like ``render_chunk``, and
+    saves the document once the records run out.
+    """
+    c = canvas.Canvas(output_file, pagesize=letter, pageCompression=int(compress))
+    c.showOutline()
+    for filename, person in numbered_tasks(records):
+        name = person.get("name", filename)
+        try:
+            report = build_report(person)
+        except Exception as e:
+            yield [(filename, name, None, f"{type(e).__name__}: {e}")]
+            continue
+
+        c.bookmarkPage(filename)
+        c.addOutlineEntry(str(name), filename, level=0)
+        draw_report(c, report)
+        yield [(filename, name, output_file, None)]
+    c.save()
+
+
+class ZipArchive:
+    """Append reports to a ZIP file, one sequential write per report.
+
+    ``file`` is a path or a binary file object, which need not be seekable.
+    """
+
+    def __init__(self, file):
+        # Page content is already deflated, so store reports as they are
+        self.archive = zipfile.ZipFile(file, "w", zipfile.ZIP_STORED)
+
+    def add(self, filename, data):
+        self.archive.writestr(filename, data)
+
+    def close(self):
+        self.archive.close()
+
+
+class TarArchive:
+    """Append reports to an uncompressed tar stream."""
+
+    def __init__(self, path):
+        self.archive = tarfile.open(path, "w|")
+
+    def add(self, filename, data):
+        info = tarfile.TarInfo(filename)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.archive.close()
+
+
+ARCHIVES = {"zip": ZipArchive, "tar": TarArchive}
+OUTPUT_MODES = ["files", "pdf", *ARCHIVES]
+
+
+def bounded_map(executor, fn, iterable, max_pending):
+    """Like ``executor.map`` but submits lazily, in completion order.
+
+    At most ``max_pending`` calls are queued at once, so the input iterable
+    is never consumed far ahead of the workers.
+    """
+    pending = set()
+    for item in iterable:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def run(
+    records,
+    output_dir,
+    workers=1,
+    chunksize=16,
+    progress_every=100,
+    verbose=False,
+    compress=True,
+    output_mode="files",
+    output=None,
+    incremental=False,
+):
+    """Generate a report per record, returning ``(succeeded, failed)`` counts.
+
+    ``output_mode`` ``files`` writes a PDF per record into ``output_dir``;
+    ``pdf``, ``zip`` and ``tar`` write every report into the single file
+    ``output``, by default ``reports.<mode>`` inside ``output_dir``.
+
+    ``incremental`` (files mode only) names reports by record identity and
+    skips records unchanged since the last run, as recorded in a manifest.
+    """
+    if incremental and output_mode != "files":
+        raise ValueError("Incremental runs only support the files output mode")
+    if output_mode == "files" or output is None:
+        os.makedirs(output_dir, exist_ok=True)
+    if output is None:
+        output = os.path.join(output_dir, f"reports.{output_mode}")
+
+    if incremental:
+        settings = {"renderer_version": RENDERER_VERSION, "compress": compress}
+        manifest = ReportManifest(output_dir, settings)
+        tasks = manifest.changed(records)
+    else:
+        manifest = None
+        tasks = numbered_tasks(records)
+
+    executor = archive = None
+    if output_mode == "pdf":
+        # Pages share one canvas, so the document is drawn in this process
+        results = render_document(records, output, compress)
+    else:
+        if output_mode in ARCHIVES:
+            # Workers return PDF bytes and only this process writes the archive
+            archive = ARCHIVES[output_mode](output)
+        render = partial(
+            render_chunk,
+            output_dir=None if archive else output_dir,
+            compress=compress,
+        )
+        chunks = chunked(tasks, chunksize)
+
+        executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        if executor is None:
+            results = map(render, chunks)
+        else:
+            results = bounded_map(executor, render, chunks, max_pending=workers * 2)
+
+    succeeded = failed = 0
+    start = time.perf_counter()
+    try:
+        for chunk_results in results:
+            for filename, name, rendered, error in chunk_results:
+                if error is None:
+                    if archive is not None:
+                        archive.add(filename, rendered)
+                        rendered = f"{output}/{filename}"
+                    succeeded += 1
+                    if verbose:
+                        print(f"Generated PDF for {name} saved as {rendered}")
+                else:
+                    failed += 1
+                    if manifest is not None:
+                        manifest.failed(filename)
+                    print(
+                        f"Failed to generate PDF for {name}: {error}", file=sys.stderr
+                    )
+
+                done = succeeded + failed
+                if progress_every and done % progress_every == 0:
+                    rate = done / (time.perf_counter() - start)
+                    print(f"Progress: {done} reports ({rate:.1f}/s)")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if archive is not None:
+            archive.close()
+
+    elapsed = time.perf_counter() - start
+    summary = f"{failed} failed"
+    if manifest is not None:
+        manifest.save()
+        summary += f", {manifest.unchanged} unchanged"
+    print(f"Generated {succeeded} reports in {elapsed:.2f}s ({summary})")
+    return succeeded, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate PDF reports from JSON data.")
+    parser.add_argument(
+        "--input", default="data/report_data.json", help="Input file, - for stdin"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["auto", "json", "ndjson"],
+        default="auto",
+        help="Input format; auto treats .ndjson/.jsonl files as NDJSON",
+    )
+    parser.add_argument("--output-dir", default="generated_pdfs")
+    parser.add_argument(
+        "--output-mode",
+        choices=OUTPUT_MODES,
+        default="files",
+        help="One PDF per record, or all reports in a single PDF, ZIP or tar file",
+    )
+    parser.add_argument(
+        "--output",
+        help="Output file for the pdf, zip and tar modes "
+        "(default <output-dir>/reports.<mode>)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (1 renders in the main process)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=16, help="Records sent to a worker per task"
+    )
+    parser.add_argument(
+        "--progress-every",
+        type=int,
+        default=100,
+        help="Report progress every N reports (0 disables)",
+    )
+    parser.add_argument(
+        "--no-compress",
+        dest="compress",
+        action="store_false",
+        help="Leave page content uncompressed, trading file size for CPU time",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only render new and changed records, tracked in a manifest "
+        "in the output directory (files mode only)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Print a line for every report"
+    )
+    args = parser.parse_args(argv)
+    if args.incremental and args.output_mode != "files":
+        parser.error("--incremental requires --output-mode files")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Stream demo data so rendering starts before the whole file is read
+    data = iter_records(args.input, args.format)
+
+    # Generate a PDF for each person in the data
+    _, failed = run(
+        data,
+        args.output_dir,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        progress_every=args.progress_every,
+        verbose=args.verbose,
+        compress=args.compress,
+        output_mode=args.output_mode,
+        output=args.output,
+        incremental=args.incremental,
+    )
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Measure report throughput of app.py across worker counts.
+
+The bundled records are repeated ``--scale`` times:
+
+    python benchmark.py --scale 500 --workers 1 2 4 8
+
+``--output-mode`` compares writing a file per report against a single
+PDF, ZIP or tar file, as in app.py.
+
+With ``--compare-encoding`` it instead renders every report in-process
+with ASCII85-encoded compressed streams (the reportlab default), binary
+compressed streams (the app default) and uncompressed streams, and reports
+CPU time and output size per report:
+
+    python benchmark.py --scale 10000 --compare-encoding
+
+With ``--work-entries`` it renders copies of the first record padded out to
+each number of work experience entries, and reports layout and total
+render time per report, pages per report and the measurement cache hit
+rates:
+
+    python benchmark.py --scale 200 --work-entries 1 10 50 200
+"""
+
+import argparse
+import io
+import itertools
+import os
+import tempfile
+import time
+
+from reportlab import rl_config
+
+import layout
+from app import OUTPUT_MODES, build_report, generate_pdf, load_data, run
+
+
+def compare_encoding(records, total):
+    variants = [
+        ("compressed+ascii85", 1, True),
+        ("compressed", 0, True),
+        ("uncompressed", 0, False),
+    ]
+    for label, use_a85, compress in variants:
+        rl_config.useA85 = use_a85
+        cpu_time = 0.0
+        output_size = 0
+        for record in records:
+            output = io.BytesIO()
+            start = time.process_time()
+            generate_pdf(record, output, compress=compress)
+            cpu_time += time.process_time() - start
+            output_size += output.getbuffer().nbytes
+
+        print(
+            f"{label:<20} {cpu_time / total * 1000:6.3f} ms CPU/report  "
+            f"{output_size / total:8.0f} bytes/report"
+        )
+
+
+def with_work_entries(record, count):
+    """Copy ``record`` with ``count`` work entries cycled from its own."""
+    jobs = itertools.islice(itertools.cycle(record["work_experience"]), count)
+    return {**record, "work_experience": list(jobs)}
+
+
+def hit_rate(cached):
+    info = cached.cache_info()
+    return info.hits / max(info.hits + info.misses, 1)
+
+
+def compare_work_entries(record, counts, repeat):
+    for count in counts:
+        padded = with_work_entries(record, count)
+        layout.string_width.cache_clear()
+        layout.wrap_text.cache_clear()
+
+        layout_time = render_time = 0.0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _, pages = build_report(padded)
+            layout_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            generate_pdf(padded, io.BytesIO())
+            render_time += time.perf_counter() - start
+
+        print(
+            f"entries={count:<4} {len(pages):3d} pages  "
+            f"{layout_time / repeat * 1000:7.3f} ms layout  "
+            f"{render_time / repeat * 1000:7.3f} ms total/report  "
+            f"cache hits: {hit_rate(layout.wrap_text):6.1%} lines "
+            f"{hit_rate(layout.string_width):6.1%} words"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default="data/report_data.json")
+    parser.add_argument("--scale", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--output-mode", choices=OUTPUT_MODES, default="files")
+    parser.add_argument("--compare-encoding", action="store_true")
+    parser.add_argument("--work-entries", type=int, nargs="+")
+    args = parser.parse_args()
+
+    records = load_data(args.input)
+    total = len(records) * args.scale
+
+    if args.work_entries:
+        print(f"Rendering each size {args.scale} times in-process")
+        compare_work_entries(records[0], args.work_entries, args.scale)
+        return
+
+    if args.compare_encoding:
+        print(f"Rendering {total} reports in-process")
+        compare_encoding(records * args.scale, total)
+        return
+
+    print(
+        f"Rendering {total} reports on {os.cpu_count()} CPUs "
+        f"({args.output_mode} output)"
+    )
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as output_dir:
+            scaled = itertools.chain.from_iterable(
+                itertools.repeat(records, args.scale)
+            )
+            start = time.perf_counter()
+            run(
+                scaled,
+                output_dir,
+                workers=workers,
+                chunksize=args.chunksize,
+                progress_every=0,
+                output_mode=args.output_mode,
+            )
+            elapsed = time.perf_counter() - start
+        print(f"workers={workers:<3} {total / elapsed:8.1f} reports/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Measured text layout for the PDF reports.
+
+Section contents are wrapped to the section width using font metrics and
+flowed down the page, continuing on a new page when a section runs past
+the bottom margin.
+"""
+
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+
+# Section parameters
+SECTION_X = 40
+SECTION_WIDTH = PAGE_WIDTH - 80
+SECTION_GAP = 30
+TITLE_FONT = ("Helvetica-Bold", 12)
+BODY_FONT = ("Helvetica", 10)
+LINE_HEIGHT = 12
+TEXT_INDENT = 20
+TEXT_WIDTH = SECTION_WIDTH - 2 * TEXT_INDENT
+
+# Offsets of the title and first content baseline from the top of a
+# section, and the padding under its last line
+TITLE_OFFSET = 25
+TEXT_OFFSET = 50
+SECTION_PADDING = 14
+
+# Vertical extent of the sections on a page, below the header bar
+CONTENT_TOP = PAGE_HEIGHT - 100
+CONTENT_BOTTOM = 40
+
+# Don't start a section at the bottom of a page with fewer lines than this
+MIN_SPLIT_LINES = 3
+
+
+@lru_cache(maxsize=65536)
+def string_width(text, font_name, font_size):
+    """Cached ``stringWidth``; widths of words recur across many reports."""
+    return stringWidth(text, font_name, font_size)
+
+
+def split_word(word, font_name, font_size, max_width):
+    """Split off the longest prefix of ``word`` that fits in ``max_width``."""
+    width = 0.0
+    for i, char in enumerate(word):
+        width += string_width(char, font_name, font_size)
+        if width > max_width:
+            return word[: max(i, 1)], word[max(i, 1) :]
+    return word, ""
+
+
+@lru_cache(maxsize=4096)
+def wrap_text(text, font_name, font_size, max_width):
+    """Break ``text`` into a tuple of lines no wider than ``max_width``.
+
+    Lines break at whitespace, and a word wider than a whole line is split
+    between characters. Widths are summed per word, which is exact for the
+    standard fonts as they have no kerning.
+    """
+    space = string_width(" ", font_name, font_size)
+    lines = []
+    line = []
+    line_width = 0.0
+
+    for word in text.split():
+        word_width = string_width(word, font_name, font_size)
+        if line and line_width + space + word_width <= max_width:
+            line.append(word)
+            line_width += space + word_width
+            continue
+
+        if line:
+            lines.append(" ".join(line))
+        while word_width > max_width:
+            head, word = split_word(word, font_name, font_size, max_width)
+            lines.append(head)
+            word_width = string_width(word, font_name, font_size)
+        line = [word] if word else []
+        line_width = word_width
+
+    if line or not lines:
+        lines.append(" ".join(line))
+    return tuple(lines)
+
+
+def section_height(line_count):
+    return TEXT_OFFSET + LINE_HEIGHT * max(line_count - 1, 0) + SECTION_PADDING
+
+
+def lines_that_fit(space):
+    """Number of content lines of a section that fit in ``space`` points."""
+    if space < section_height(1):
+        return 0
+    return int((space - section_height(1)) // LINE_HEIGHT) + 1
+
+
+def strip_blank(lines):
+    """Drop blank lines at either end, e.g. spacing left at a page break."""
+    start, end = 0, len(lines)
+    while start < end and not lines[start]:
+        start += 1
+    while end > start and not lines[end - 1]:
+        end -= 1
+    return lines[start:end]
+
+
+def paginate(sections):
+    """Flow ``(title, lines)`` sections onto pages.
+
+    Lines are wrapped to the section width first. Returns a list of pages,
+    each a list of ``(title, lines, top, height)`` boxes. A section that
+    doesn't fit in the space left on a page is split, and the rest of it
+    continues under the same title on the next page.
+    """
+    pages = [[]]
+    top = CONTENT_TOP
+
+    for section_title, content_lines in sections:
+        title = section_title
+        lines = [
+            wrapped
+            for line in content_lines
+            for wrapped in wrap_text(str(line), *BODY_FONT, TEXT_WIDTH)
+        ]
+        lines = strip_blank(lines)
+
+        while True:
+            capacity = lines_that_fit(top - CONTENT_BOTTOM)
+            fits = len(lines) <= capacity and capacity > 0
+            # On a fresh page the section is split however long it is
+            splittable = capacity >= MIN_SPLIT_LINES or top == CONTENT_TOP
+
+            if fits or splittable:
+                placed = lines if fits else strip_blank(lines[:capacity])
+                height = section_height(len(placed))
+                pages[-1].append((title, placed, top, height))
+                top -= height + SECTION_GAP
+                if fits:
+                    break
+                lines = strip_blank(lines[capacity:])
+                title = f"{section_title} (continued)"
+
+            pages.append([])
+            top = CONTENT_TOP
+
+    return pages
@@ -0,0 +1,73 @@
+"""Latency load test for the /reports endpoint of service.py.
+
+Fires a fixed number of requests at each concurrency level, cycling
+through the records in the data file, and reports throughput and latency
+percentiles:
+
+    python load_test.py --url http://localhost:8000 --requests 500 --concurrency 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+from app import load_data
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_level(client, url, records, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(record):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/reports", json=record)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in itertools.islice(records, total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50, p95, p99 = (percentile(latencies, f) * 1000 for f in (0.50, 0.95, 0.99))
+    print(
+        f"concurrency={concurrency:<4} requests={total:<6} errors={errors:<4} "
+        f"throughput={len(latencies) / elapsed:8.2f} req/s  "
+        f"p50={p50:7.1f} ms  p95={p95:7.1f} ms  p99={p99:7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--input", default="data/report_data.json")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    records = itertools.cycle(load_data(args.input))
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        for concurrency in args.concurrency:
+            await run_level(client, args.url, records, args.requests, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""Manifest of rendered reports for incremental runs.
+
+The manifest maps a stable identity of each record to a hash of its
+content and the file its report was written to, so a rerun only renders
+new or changed records and removes reports of records that are gone.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+MANIFEST_NAME = "manifest.json"
+
+
+def record_identity(record):
+    """Stable key of a record: its ``id``, else contact email, else name."""
+    if record.get("id") is not None:
+        return f"id:{record['id']}"
+    email = (record.get("contact") or {}).get("email")
+    if email:
+        return f"email:{email.lower()}"
+    if record.get("name"):
+        return f"name:{record['name']}"
+    return None
+
+
+def record_hash(record):
+    encoded = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def identity_filename(identity):
+    """Readable, filesystem-safe report filename for a record identity."""
+    slug = re.sub(r"[^a-z0-9]+", "-", identity.lower()).strip("-")[:40]
+    digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:8]
+    return f"report_{slug}-{digest}.pdf"
+
+
+class ReportManifest:
+    """Track which records of a run need rendering in ``output_dir``.
+
+    Entries from a previous run only count if it used the same renderer
+    ``settings`` (e.g. its version), so anything that changes the report
+    output re-renders everything.
+    """
+
+    def __init__(self, output_dir, settings):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.settings = settings
+        self.previous, self.reusable = self._load()
+        self.current = {}
+        self.identities = {}
+        self.unchanged = 0
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return {}, False
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {self.path}: {e}", file=sys.stderr)
+            return {}, False
+        # Outputs of other settings are still tracked so stale ones get removed
+        return manifest.get("reports", {}), manifest.get("settings") == self.settings
+
+    def changed(self, records):
+        """Yield ``(filename, record)`` tasks for new and changed records."""
+        for index, record in enumerate(records):
+            identity = record_identity(record) or f"index:{index + 1}"
+            if identity in self.current:
+                print(
+                    f"Duplicate record identity {identity}, "
+                    f"keying record {index + 1} by position",
+                    file=sys.stderr,
+                )
+                identity = f"{identity}#{index + 1}"
+
+            filename = identity_filename(identity)
+            entry = {"hash": record_hash(record), "file": filename}
+            self.current[identity] = entry
+            self.identities[filename] = identity
+
+            path = os.path.join(self.output_dir, filename)
+            if (
+                self.reusable
+                and self.previous.get(identity) == entry
+                and os.path.exists(path)
+            ):
+                self.unchanged += 1
+                continue
+            yield filename, record
+
+    def failed(self, filename):
+        """Mark a record that failed to render so the next run retries it.
+
+        A report left by an earlier run is kept until a render succeeds.
+        """
+        identity = self.identities[filename]
+        previous = self.previous.get(identity)
+        if previous is None:
+            self.current.pop(identity, None)
+        else:
+            # No record hashes to None, so the entry never counts as unchanged
+            self.current[identity] = {"hash": None, "file": previous["file"]}
+
+    def save(self):
+        """Delete reports no longer in the manifest and write it out."""
+        current_files = {entry["file"] for entry in self.current.values()}
+        for entry in self.previous.values():
+            if entry["file"] not in current_files:
+                try:
+                    os.remove(os.path.join(self.output_dir, entry["file"]))
+                except FileNotFoundError:
+                    pass
+
+        manifest = {"settings": self.settings, "reports": self.current}
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, self.path)
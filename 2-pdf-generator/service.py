@@ -0,0 +1,192 @@
+"""HTTP service rendering reports on a warm pool of worker processes.
+
+Run it with:
+
+    uvicorn service:app --host 0.0.0.0 --port 8000
+
+Reports are rendered into memory and returned directly, so no files are
+written. The worker processes are started and warmed up with a sample
+report when the service starts, so requests don't pay for interpreter
+startup, imports or font loading.
+"""
+
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from app import (
+    ZipArchive,
+    chunked,
+    load_data,
+    numbered_tasks,
+    render_chunk,
+    render_pdf_bytes,
+)
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 1)))
+RENDER_CHUNKSIZE = int(os.getenv("RENDER_CHUNKSIZE", "16"))
+BATCH_MAX_RECORDS = int(os.getenv("BATCH_MAX_RECORDS", "10000"))
+PDF_COMPRESS = os.getenv("PDF_COMPRESS", "true").lower() == "true"
+WARMUP_DATA = os.getenv("WARMUP_DATA", "data/report_data.json")
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="PDF Report Generator")
+
+executor = None
+
+
+def warm_up(record):
+    """Render a throwaway report so a worker has everything loaded."""
+    render_pdf_bytes(record, PDF_COMPRESS)
+    return os.getpid()
+
+
+@app.on_event("startup")
+async def startup_event():
+    global executor
+    executor = ProcessPoolExecutor(RENDER_WORKERS)
+
+    try:
+        sample = load_data(WARMUP_DATA)[0]
+    except Exception as e:
+        logger.warning(f"Skipping worker warm-up: {str(e)}")
+        return
+
+    loop = asyncio.get_running_loop()
+    pids = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, warm_up, sample)
+            for _ in range(RENDER_WORKERS)
+        )
+    )
+    logger.info(f"Warmed up {len(set(pids))} render workers")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    executor.shutdown(cancel_futures=True)
+
+
+class StreamBuffer(io.RawIOBase):
+    """Unseekable file object whose written bytes are drained by the reader."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def stream_zip(records):
+    """Yield a ZIP archive of the records' reports as they are rendered.
+
+    Like ``app.bounded_map``, at most ``RENDER_WORKERS * 2`` chunks are
+    submitted at once, so a large batch doesn't flood the pool ahead of
+    other requests. Records that fail to render are listed in an
+    ``errors.txt`` entry at the end of the archive, since the response
+    status is already sent.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = chunked(numbered_tasks(records), RENDER_CHUNKSIZE)
+    max_pending = RENDER_WORKERS * 2
+    pending = set()
+    buffer = StreamBuffer()
+    archive = ZipArchive(buffer)
+    errors = []
+
+    try:
+        while True:
+            for chunk in islice(chunks, max_pending - len(pending)):
+                pending.add(
+                    loop.run_in_executor(
+                        executor, render_chunk, chunk, None, PDF_COMPRESS
+                    )
+                )
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                for filename, name, pdf, error in future.result():
+                    if error is None:
+                        archive.add(filename, pdf)
+                    else:
+                        errors.append(f"{filename} ({name}): {error}")
+            if data := buffer.drain():
+                yield data
+
+        if errors:
+            archive.add("errors.txt", "\n".join(errors) + "\n")
+        archive.close()
+        yield buffer.drain()
+    finally:
+        # Stop rendering if the client went away mid-stream
+        for future in pending:
+            future.cancel()
+
+
+@app.post("/reports")
+async def create_report(record: Dict[str, Any]):
+    """Render one record and return the PDF."""
+    loop = asyncio.get_running_loop()
+    try:
+        pdf = await loop.run_in_executor(
+            executor, render_pdf_bytes, record, PDF_COMPRESS
+        )
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Render workers unavailable")
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Error rendering report: {type(e).__name__}: {e}",
+        )
+
+    return Response(
+        pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'inline; filename="report.pdf"'},
+    )
+
+
+@app.post("/reports/batch")
+async def create_reports(records: List[Dict[str, Any]]):
+    """Render many records and stream the PDFs back in a ZIP archive."""
+    if len(records) > BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the maximum of {BATCH_MAX_RECORDS} records",
+        )
+
+    return StreamingResponse(
+        stream_zip(records),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="reports.zip"'},
+    )
+
+
+@app.get("/health")
+async def health_check():
+    """Simple health check endpoint."""
+    return {"status": "healthy"}
@@ -0,0 +1,46 @@
+import io
+import json
+
+import pytest
+
+from app import iter_json_array
+
+VALID = [
+    "[]",
+    " [ ] ",
+    "[1.5]",
+    "[1e5]",
+    "[1, 2.5, 3]",
+    "[-0.25, 10, 1E-3]",
+    '["a, b]", {"c": [1, 2]}, true, null]',
+    '[{"name": "Jane"},\n {"name": "John"}]\n',
+]
+
+INVALID = [
+    "",
+    "{}",
+    "[",
+    "[1",
+    "[1,",
+    "[1 2]",
+    "[,1]",
+    "[1,]",
+    "[1,,2]",
+    "[] trailing",
+    "[1x]",
+    '["a" "b"]',
+]
+
+
+@pytest.mark.parametrize("text", VALID)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 64 * 1024])
+def test_valid_arrays_match_json_loads(text, chunk_size):
+    items = list(iter_json_array(io.StringIO(text), chunk_size))
+    assert items == json.loads(text)
+
+
+@pytest.mark.parametrize("text", INVALID)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 64 * 1024])
+def test_invalid_arrays_are_rejected(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size))
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from app import build_report, load_data
+from layout import (
+    BODY_FONT,
+    CONTENT_BOTTOM,
+    CONTENT_TOP,
+    SECTION_GAP,
+    TEXT_WIDTH,
+    lines_that_fit,
+    paginate,
+    section_height,
+    string_width,
+    wrap_text,
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "report_data.json")
+
+PAGE_LINES = lines_that_fit(CONTENT_TOP - CONTENT_BOTTOM)
+
+
+def wrap(text):
+    return wrap_text(text, *BODY_FONT, TEXT_WIDTH)
+
+
+def fits(line):
+    return string_width(line, *BODY_FONT) <= TEXT_WIDTH
+
+
+def test_short_text_is_one_line():
+    assert wrap("Role: Junior Developer") == ("Role: Junior Developer",)
+
+
+def test_long_text_breaks_at_whitespace():
+    text = " ".join(["responsibility"] * 40)
+    lines = wrap(text)
+    assert len(lines) > 1
+    assert all(fits(line) for line in lines)
+    assert " ".join(lines) == text
+
+
+def test_word_wider_than_line_is_split_between_characters():
+    word = "x" * 300
+    lines = wrap(f"start {word} end")
+    assert len(lines) > 2
+    assert all(fits(line) and line for line in lines)
+    assert "".join(lines).replace(" ", "") == f"start{word}end"
+
+
+@pytest.mark.parametrize("text", ["", "   "])
+def test_empty_text_is_one_blank_line(text):
+    assert wrap(text) == ("",)
+
+
+def test_empty_section_gets_an_empty_box():
+    [[box]] = paginate([("Education", [])])
+    assert box == ("Education", [], CONTENT_TOP, section_height(0))
+
+
+def test_section_exactly_filling_a_page_stays_on_it():
+    lines = [f"line {i}" for i in range(PAGE_LINES)]
+    [[(title, placed, top, height)]] = paginate([("Work Experience", lines)])
+    assert (title, placed, top) == ("Work Experience", lines, CONTENT_TOP)
+    assert top - height >= CONTENT_BOTTOM
+
+
+def test_section_one_line_over_a_page_continues_on_the_next():
+    lines = [f"line {i}" for i in range(PAGE_LINES + 1)]
+    first, second = paginate([("Work Experience", lines)])
+    assert [box[1] for box in first] == [lines[:-1]]
+    assert second == [
+        ("Work Experience (continued)", lines[-1:], CONTENT_TOP, section_height(1))
+    ]
+
+
+def test_short_remainder_starts_section_on_a_new_page():
+    filler = [f"line {i}" for i in range(PAGE_LINES - 3)]
+    first, second = paginate([("Education", filler), ("Contact", ["a", "b"])])
+    assert [box[0] for box in first] == ["Education"]
+    assert [box[0] for box in second] == ["Contact"]
+
+
+@pytest.mark.parametrize("index", [0, 1])
+def test_bundled_records_keep_their_single_page_layout(index):
+    record = load_data(DATA)[index]
+    # Section contents as drawn before layout was measured, all on one page
+    expected = [
+        (
+            "Personal Information",
+            [
+                f"Age: {record['age']}",
+                f"Location: {record['location']}",
+                f"Position: {record['job']}",
+                f"Salary: {record['salary']}",
+            ],
+        ),
+        ("Contact Information", list(record["contact"].values())),
+        (
+            "Education",
+            [
+                f"{edu['degree']} in {edu['field']} - {edu['university']} "
+                f"({edu['year']})"
+                for edu in record["education"]
+            ],
+        ),
+    ]
+    work = []
+    for job in record["work_experience"]:
+        work += [
+            f"Role: {job['position']}",
+            f"Company: {job['company']} ({job['start_year']}-{job['end_year']})",
+            f"Responsibilities: {job['responsibilities']}",
+            "",
+        ]
+    expected.append(("Work Experience", work[:-1]))
+
+    title, pages = build_report(record)
+    assert title == f"{record['name']} - Professional Report"
+    [boxes] = pages
+    assert [(box[0], box[1]) for box in boxes] == expected
+
+    top = CONTENT_TOP
+    for _, lines, box_top, height in boxes:
+        assert box_top == top
+        assert height == section_height(len(lines))
+        top -= height + SECTION_GAP
+    assert box_top - height >= CONTENT_BOTTOM
@@ -0,0 +1,49 @@
+import json
+import os
+
+from app import load_data, run
+from manifest import MANIFEST_NAME, identity_filename
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "report_data.json")
+
+
+def render(records, output_dir):
+    return run(records, str(output_dir), progress_every=0, incremental=True)
+
+
+def read_manifest(output_dir):
+    with open(os.path.join(output_dir, MANIFEST_NAME)) as file:
+        return json.load(file)["reports"]
+
+
+def test_failed_rerender_keeps_previous_report_and_retries(tmp_path):
+    record = dict(load_data(DATA)[0], id=1)
+    path = tmp_path / identity_filename("id:1")
+
+    assert render([record], tmp_path) == (1, 0)
+    report = path.read_bytes()
+
+    broken = {key: value for key, value in record.items() if key != "education"}
+    assert render([broken], tmp_path) == (0, 1)
+    assert path.read_bytes() == report
+    assert read_manifest(tmp_path)["id:1"]["hash"] is None
+
+    # The entry never matches, so the next run renders the record again
+    assert render([record], tmp_path) == (1, 0)
+    assert read_manifest(tmp_path)["id:1"]["hash"] is not None
+
+
+def test_failed_new_record_is_left_out_of_the_manifest(tmp_path):
+    record = {"id": 2, "name": "Broken"}
+    assert render([record], tmp_path) == (0, 1)
+    assert read_manifest(tmp_path) == {}
+    assert not (tmp_path / identity_filename("id:2")).exists()
+
+
+def test_removed_record_report_is_deleted(tmp_path):
+    records = load_data(DATA)
+    records = [dict(record, id=i) for i, record in enumerate(records)]
+    render(records, tmp_path)
+    render(records[:1], tmp_path)
+    assert (tmp_path / identity_filename("id:0")).exists()
+    assert not (tmp_path / identity_filename("id:1")).exists()
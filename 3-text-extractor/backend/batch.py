@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Union
+
+from models import PrescriptionData
+
+
+class RateLimiter:
+    """Token bucket limiting how many calls may start per second.
+
+    A ``rate`` of zero or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        """Wait until a call is allowed to start."""
+        if self.rate <= 0:
+            return
+
+        # Created lazily so the lock binds to the server's running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            # Waiters queue on the lock, so the deficit is paid off in order
+            self._tokens -= 1
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.rate)
+
+
+async def run_batch(
+    texts: List[str],
+    extract: Callable[[str], Awaitable[PrescriptionData]],
+    concurrency: int,
+    limiter: RateLimiter,
+) -> List[Union[PrescriptionData, Exception]]:
+    """Extract every text with at most ``concurrency`` calls in flight.
+
+    Failures are returned in place of the result instead of being raised, so
+    one bad item never aborts the rest of the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def extract_one(text: str):
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                return await extract(text)
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(extract_one(text) for text in texts))
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from database import DatabaseManager
+from models import PrescriptionData
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different resubmissions share a key."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(text: str, model: str, prompt_version: str) -> str:
+    """Content-addressed key for an extraction request."""
+    payload = "\0".join([model, prompt_version, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier cache of extraction results.
+
+    An in-process LRU sits in front of the ``extraction_cache`` table, so
+    repeats are served from memory and survive restarts via Postgres. Entries
+    expire after ``ttl`` seconds (``0`` keeps them forever).
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_entries=1024, ttl=0):
+        self.db_manager = db_manager
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()  # key -> (data, stored_at)
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "evictions": 0,
+        }
+
+    async def get(self, key: str) -> Optional[PrescriptionData]:
+        """Return the cached extraction for ``key``, or None on a miss."""
+        data = self._get_memory(key)
+        if data is not None:
+            self._count("memory_hits")
+            return data
+
+        try:
+            entry = await asyncio.to_thread(
+                self.db_manager.get_cached_extraction, key, self.ttl
+            )
+        except Exception as e:
+            logger.warning(f"Extraction cache lookup failed: {str(e)}")
+            self._count("errors")
+            entry = None
+
+        if entry is None:
+            self._count("misses")
+            return None
+
+        # Keep the row's age so the entry expires when the stored row does
+        data, age = entry
+        self._count("persistent_hits")
+        self._set_memory(key, data, time.monotonic() - age)
+        return data
+
+    async def set(self, key: str, data: PrescriptionData):
+        """Store an extraction in both tiers, ignoring missing results."""
+        if data is None:
+            return
+        self._set_memory(key, data, time.monotonic())
+        try:
+            await asyncio.to_thread(self.db_manager.store_cached_extraction, key, data)
+        except Exception as e:
+            logger.warning(f"Extraction cache write failed: {str(e)}")
+            self._count("errors")
+
+    def stats(self):
+        """Return hit/miss counters and the current memory tier size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl"] = self.ttl
+        return stats
+
+    def _get_memory(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, stored_at = entry
+            if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Hand out copies so callers can't mutate the cached entry
+            return data.model_copy(deep=True)
+
+    def _set_memory(self, key, data, stored_at):
+        with self._lock:
+            self._entries[key] = (data.model_copy(deep=True), stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
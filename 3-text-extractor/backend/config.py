@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from pydantic_settings import BaseSettings
 
@@ -7,11 +8,81 @@ class Settings(BaseSettings):
     """Application configuration settings."""
 
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    # Cheaper model for inputs up to SMALL_MODEL_MAX_INPUT_TOKENS, unset disables
+    OPENAI_SMALL_MODEL: Optional[str] = os.getenv("OPENAI_SMALL_MODEL")
+    SMALL_MODEL_MAX_INPUT_TOKENS: int = int(
+        os.getenv("SMALL_MODEL_MAX_INPUT_TOKENS", "150")
+    )
+    # Sent as prompt_cache_key, which older openai SDKs reject; unset disables
+    OPENAI_PROMPT_CACHE_KEY: Optional[str] = os.getenv("OPENAI_PROMPT_CACHE_KEY")
+    # Input preprocessing
+    PREPROCESS_ENABLED: bool = os.getenv("PREPROCESS_ENABLED", "true").lower() == "true"
+    PROMPT_MAX_INPUT_TOKENS: int = int(os.getenv("PROMPT_MAX_INPUT_TOKENS", "2000"))
+
+    # LLM call resilience
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "20"))
+    LLM_DEADLINE: float = float(os.getenv("LLM_DEADLINE", "60"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    # Seconds after which a slow request is raced by a second one, 0 disables
+    LLM_HEDGE_AFTER: float = float(os.getenv("LLM_HEDGE_AFTER", "0"))
+    # Consecutive failures that open the circuit breaker, 0 disables it
+    LLM_BREAKER_THRESHOLD: int = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+    LLM_BREAKER_RESET: float = float(os.getenv("LLM_BREAKER_RESET", "30"))
+    # Seconds of LLM call outcomes behind the success rate used for readiness
+    LLM_HEALTH_WINDOW: float = float(os.getenv("LLM_HEALTH_WINDOW", "60"))
+
     DB_NAME: str = os.getenv("DB_NAME")
     DB_USER: str = os.getenv("DB_USER")
     DB_PASS: str = os.getenv("DB_PASS")
     DB_HOST: str = os.getenv("DB_HOST")
 
+    # Connection pool
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_MAX_IDLE: float = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+    DB_POOL_CHECK_AFTER: float = float(os.getenv("DB_POOL_CHECK_AFTER", "30"))
+
+    DB_BULK_CHUNK_SIZE: int = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))
+
+    # Rule-based fast path
+    FASTPATH_ENABLED: bool = os.getenv("FASTPATH_ENABLED", "true").lower() == "true"
+    FASTPATH_MIN_CONFIDENCE: float = float(os.getenv("FASTPATH_MIN_CONFIDENCE", "1.0"))
+
+    # Batch extraction
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "10"))
+    BATCH_RATE_LIMIT: float = float(os.getenv("BATCH_RATE_LIMIT", "0"))
+
+    # Multi-prescription documents
+    DOCUMENT_MAX_PRESCRIPTIONS: int = int(
+        os.getenv("DOCUMENT_MAX_PRESCRIPTIONS", "20")
+    )
+
+    # Extraction cache
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_TTL: float = float(os.getenv("CACHE_TTL", "604800"))
+
+    # Readiness probes
+    READINESS_INTERVAL: float = float(os.getenv("READINESS_INTERVAL", "5"))
+    READINESS_PROBE_TIMEOUT: float = float(os.getenv("READINESS_PROBE_TIMEOUT", "2"))
+    READINESS_MIN_LLM_SUCCESS: float = float(
+        os.getenv("READINESS_MIN_LLM_SUCCESS", "0.5")
+    )
+
+    # Job queue workers
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "10"))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    JOB_STALE_AFTER: float = float(os.getenv("JOB_STALE_AFTER", "300"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # Port serving the worker's Prometheus metrics, 0 disables it
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+
     class Config:
         env_file = ".env"
 
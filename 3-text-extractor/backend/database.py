@@ -1,13 +1,215 @@
+import asyncio
 import logging
+import math
+import re
+import threading
 import time
-from datetime import datetime
+from collections import deque
+from datetime import date, datetime
+from typing import List, Optional, Tuple
 
 import psycopg2
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor, execute_values
 from config import settings
+from metrics import DB_CONNECT_FAILURES, stage_timers
 from models import PrescriptionData
 
 logger = logging.getLogger(__name__)
 
+JOB_COLUMNS = "id, status, result, error, created_at, started_at, finished_at"
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of PostgreSQL connections.
+
+    Connections are opened lazily up to ``max_size``; callers block for up to
+    ``timeout`` seconds when the pool is exhausted. Connections idle for longer
+    than ``check_after`` seconds are pinged before being handed out, and idle
+    connections above ``min_size`` are closed after ``max_idle`` seconds.
+    """
+
+    def __init__(
+        self, connect, min_size=1, max_size=10, timeout=30, max_idle=300, check_after=30
+    ):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Invalid pool size: require 0 <= min_size <= max_size")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+
+        self._idle = deque()  # (connection, last_used) pairs, newest on the right
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "connections_created": 0,
+            "connections_closed": 0,
+            "health_check_failures": 0,
+        }
+
+    def getconn(self):
+        """Check out a healthy connection, waiting if the pool is exhausted."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            with self._cond:
+                conn, last_used = self._reserve_locked(deadline)
+                if conn is None and last_used is None:
+                    waited = True
+                    continue
+
+            if conn is None:
+                # A slot was reserved, open a new connection outside the lock
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["connections_created"] += 1
+            elif not self._is_healthy(conn, last_used):
+                self._discard(conn)
+                with self._cond:
+                    self._stats["health_check_failures"] += 1
+                continue
+
+            self._record_checkout(time.monotonic() - start, waited)
+            return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool, closing it if it is unusable."""
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Return a snapshot of pool usage and wait-time metrics."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=self._size - len(self._idle),
+                min_size=self.min_size,
+                max_size=self.max_size,
+            )
+        checkouts = stats["checkouts"]
+        stats["wait_time_avg"] = (
+            stats["wait_time_total"] / checkouts if checkouts else 0.0
+        )
+        return stats
+
+    def _reserve_locked(self, deadline):
+        """Pop an idle connection or reserve a slot for a new one.
+
+        Returns ``(conn, last_used)`` for an idle connection, ``(None, 0)``
+        when a new slot was reserved and ``(None, None)`` after waiting.
+        """
+        if self._closed:
+            raise PoolTimeoutError("Connection pool is closed")
+
+        self._evict_idle_locked()
+        if self._idle:
+            return self._idle.pop()
+        if self._size < self.max_size:
+            self._size += 1
+            return None, 0
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._stats["timeouts"] += 1
+            raise PoolTimeoutError(
+                f"Timed out after {self.timeout}s waiting for a database connection"
+            )
+        self._cond.wait(remaining)
+        return None, None
+
+    def _evict_idle_locked(self):
+        """Close the oldest idle connections beyond ``min_size``."""
+        now = time.monotonic()
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.max_idle
+        ):
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.check_after:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["connections_closed"] += 1
+            self._cond.notify()
+
+    def _record_checkout(self, wait_time, waited):
+        with self._cond:
+            self._stats["checkouts"] += 1
+            self._stats["waits"] += int(waited)
+            self._stats["wait_time_total"] += wait_time
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+
 
 class DatabaseManager:
     """Handles all database operations."""
@@ -19,8 +221,28 @@ class DatabaseManager:
             "password": settings.DB_PASS,
             "host": settings.DB_HOST,
         }
+        self.pool = ConnectionPool(
+            self._connect,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            timeout=settings.DB_POOL_TIMEOUT,
+            max_idle=settings.DB_POOL_MAX_IDLE,
+            check_after=settings.DB_POOL_CHECK_AFTER,
+        )
+
+    def _connect(self):
+        """Open a connection for the pool in a single attempt.
 
-    def get_connection(self, max_retries=5, retry_delay=2):
+        Retrying here would keep the caller waiting well past the pool's
+        checkout timeout, so the attempt is bounded by it too.
+        """
+        return self.get_connection(
+            max_retries=1,
+            connect_timeout=max(1, math.ceil(settings.DB_POOL_TIMEOUT)),
+        )
+
+    @stage_timers["db_connect"].time()
+    def get_connection(self, max_retries=5, retry_delay=2, connect_timeout=None):
         """Create and return a database connection with retry mechanism."""
         retries = 0
         last_exception = None
@@ -30,8 +252,11 @@ class DatabaseManager:
                 logger.info(
                     f"Attempting to connect to database (attempt {retries + 1}/{max_retries})..."
                 )
-                return psycopg2.connect(**self.connection_params)
+                return psycopg2.connect(
+                    **self.connection_params, connect_timeout=connect_timeout
+                )
             except psycopg2.OperationalError as e:
+                DB_CONNECT_FAILURES.inc()
                 last_exception = e
                 retries += 1
                 if retries < max_retries:
@@ -45,10 +270,28 @@ class DatabaseManager:
         logger.error(f"Failed to connect to database after {max_retries} attempts")
         raise last_exception
 
+    def ping(self):
+        """Check out a pooled connection and run a trivial query on it."""
+        conn = self.pool.getconn()
+        discard = False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1;")
+            cursor.close()
+        except psycopg2.Error:
+            discard = True
+            raise
+        finally:
+            self.pool.putconn(conn, discard=discard)
+
     def initialize_tables(self):
-            """Create necessary tables if they don't exist."""
+            """Create necessary tables if they don't exist.
+
+            Runs at startup, so it connects outside the pool and keeps
+            retrying while the database is still coming up.
+            """
+            conn = self.get_connection()
             try:
-                conn = self.get_connection()
                 cursor = conn.cursor()
                 
                 create_tables_query = """
@@ -87,30 +330,268 @@ class DatabaseManager:
                     notes TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
+
+                -- Create extraction_cache table keyed by content hash
+                CREATE TABLE IF NOT EXISTS extraction_cache (
+                    cache_key CHAR(64) PRIMARY KEY,
+                    data JSONB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Create extraction_jobs table used as a work queue
+                CREATE TABLE IF NOT EXISTS extraction_jobs (
+                    id SERIAL PRIMARY KEY,
+                    input_text TEXT NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                    result JSONB,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                );
+                CREATE INDEX IF NOT EXISTS extraction_jobs_pending_idx
+                    ON extraction_jobs (id) WHERE status IN ('queued', 'running');
+
+                -- Indexes backing the prescription query API. Filters are
+                -- paired with id so keyset pagination can walk the index.
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS prescriptions_patient_id_idx
+                    ON prescriptions (patient_id, id);
+                CREATE INDEX IF NOT EXISTS prescriptions_rx_number_idx
+                    ON prescriptions (rx_number, id);
+                CREATE INDEX IF NOT EXISTS prescriptions_prescriber_id_idx
+                    ON prescriptions (prescriber_id, id);
+                CREATE INDEX IF NOT EXISTS prescriptions_date_written_idx
+                    ON prescriptions (date_written, id);
+                CREATE INDEX IF NOT EXISTS prescriptions_controlled_idx
+                    ON prescriptions (id) WHERE is_controlled_substance;
+                CREATE INDEX IF NOT EXISTS prescriptions_medication_id_idx
+                    ON prescriptions (medication_id);
+                CREATE INDEX IF NOT EXISTS prescriptions_created_at_idx
+                    ON prescriptions (created_at);
+                CREATE INDEX IF NOT EXISTS medication_details_name_trgm_idx
+                    ON medication_details USING gin (name gin_trgm_ops);
                 """
                 
                 cursor.execute(create_tables_query)
                 conn.commit()
                 cursor.close()
-                conn.close()
                 logger.info("Database tables initialized successfully")
                 
             except Exception as e:
                 logger.error(f"Error initializing database tables: {str(e)}")
                 raise
 
+            finally:
+                conn.close()
+
     def store_prescription(self, data: PrescriptionData):
         """Store prescription data in the database."""
-        conn = self.get_connection()
+        with stage_timers["db_acquire"].time():
+            conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            self._insert_prescription(cursor, data)
+
+            with stage_timers["commit"].time():
+                conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def store_prescriptions(
+        self, items: List[PrescriptionData], chunk_size: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Store many prescriptions using multi-row inserts.
+
+        Items are written in chunks of ``chunk_size`` (``DB_BULK_CHUNK_SIZE``
+        by default), each chunk in a single transaction with one INSERT per
+        table. If a chunk is rejected, it is retried row by row so only the
+        bad rows fail. Returns one entry per item: ``None`` when it was
+        stored, otherwise the error message.
+        """
+        if not items:
+            return []
+
+        chunk_size = chunk_size or settings.DB_BULK_CHUNK_SIZE
+        conn = self.pool.getconn()
+        errors = []
+
+        try:
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start : start + chunk_size]
+                try:
+                    errors.extend(self._store_chunk(conn, chunk))
+                except psycopg2.Error as e:
+                    # Earlier chunks are committed, fail this and the remaining ones
+                    logger.error(f"Error storing prescriptions: {str(e)}")
+                    if not conn.closed:
+                        conn.rollback()
+                    errors.extend([str(e).strip()] * (len(items) - start))
+                    break
+
+            return errors
+
+        finally:
+            self.pool.putconn(conn)
+
+    def store_prescription_group(self, items: List[PrescriptionData]):
+        """Store prescriptions in a single transaction, all of them or none."""
+        with stage_timers["db_acquire"].time():
+            conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            self._bulk_insert_prescriptions(cursor, items)
+
+            with stage_timers["commit"].time():
+                conn.commit()
+            return True
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def _store_chunk(self, conn, chunk: List[PrescriptionData]) -> List[Optional[str]]:
         cursor = conn.cursor()
 
         try:
-            # Insert medication details
-            medication_insert = """
-            INSERT INTO medication_details (name, strength, form, quantity)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id;
+            try:
+                self._bulk_insert_prescriptions(cursor, chunk)
+                conn.commit()
+                return [None] * len(chunk)
+            except (psycopg2.DataError, psycopg2.IntegrityError):
+                conn.rollback()
+
+            # Retry the rejected chunk one row at a time to isolate the bad rows
+            errors = []
+            for data in chunk:
+                cursor.execute("SAVEPOINT store_prescription")
+                try:
+                    self._insert_prescription(cursor, data)
+                    cursor.execute("RELEASE SAVEPOINT store_prescription")
+                    errors.append(None)
+                except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT store_prescription")
+                    errors.append(str(e).strip())
+
+            conn.commit()
+            return errors
+
+        finally:
+            cursor.close()
+
+    def _bulk_insert_prescriptions(self, cursor, chunk: List[PrescriptionData]):
+        """Insert a chunk of prescriptions with one statement per table."""
+        # Reserve ids up front so the rows can reference each other
+        cursor.execute(
             """
+            SELECT nextval('medication_details_id_seq'),
+                   nextval('dosage_instructions_id_seq')
+            FROM generate_series(1, %s);
+            """,
+            (len(chunk),),
+        )
+        ids = cursor.fetchall()
+
+        medication_rows = []
+        dosage_rows = []
+        prescription_rows = []
+        for data, (medication_id, dosage_id) in zip(chunk, ids):
+            medication_rows.append(
+                (
+                    medication_id,
+                    data.medication.name,
+                    data.medication.strength,
+                    data.medication.form,
+                    data.medication.quantity,
+                )
+            )
+            dosage_rows.append(
+                (
+                    dosage_id,
+                    data.dosage.frequency,
+                    data.dosage.duration,
+                    data.dosage.special_instructions,
+                )
+            )
+            prescription_rows.append(
+                (
+                    data.rx_number,
+                    self._parse_date(data.date_written),
+                    data.patient_name,
+                    self._parse_date(data.patient_dob) if data.patient_dob else None,
+                    data.patient_id,
+                    medication_id,
+                    dosage_id,
+                    data.prescriber_name,
+                    data.prescriber_id,
+                    data.pharmacy_name,
+                    data.refills,
+                    data.is_controlled_substance,
+                    data.notes,
+                )
+            )
+
+        page_size = len(chunk)
+        execute_values(
+            cursor,
+            """
+            INSERT INTO medication_details (id, name, strength, form, quantity)
+            VALUES %s;
+            """,
+            medication_rows,
+            page_size=page_size,
+        )
+        execute_values(
+            cursor,
+            """
+            INSERT INTO dosage_instructions
+                (id, frequency, duration, special_instructions)
+            VALUES %s;
+            """,
+            dosage_rows,
+            page_size=page_size,
+        )
+        execute_values(
+            cursor,
+            """
+            INSERT INTO prescriptions (
+                rx_number, date_written, patient_name, patient_dob, patient_id,
+                medication_id, dosage_id, prescriber_name, prescriber_id,
+                pharmacy_name, refills, is_controlled_substance, notes
+            )
+            VALUES %s;
+            """,
+            prescription_rows,
+            page_size=page_size,
+        )
+
+    def _insert_prescription(self, cursor, data: PrescriptionData):
+        """Insert one prescription and its medication and dosage rows."""
+        # Insert medication details
+        medication_insert = """
+        INSERT INTO medication_details (name, strength, form, quantity)
+        VALUES (%s, %s, %s, %s)
+        RETURNING id;
+        """
+        with stage_timers["insert_medication"].time():
             cursor.execute(
                 medication_insert,
                 (
@@ -122,12 +603,13 @@ class DatabaseManager:
             )
             medication_id = cursor.fetchone()[0]
 
-            # Insert dosage instructions
-            dosage_insert = """
-            INSERT INTO dosage_instructions (frequency, duration, special_instructions)
-            VALUES (%s, %s, %s)
-            RETURNING id;
-            """
+        # Insert dosage instructions
+        dosage_insert = """
+        INSERT INTO dosage_instructions (frequency, duration, special_instructions)
+        VALUES (%s, %s, %s)
+        RETURNING id;
+        """
+        with stage_timers["insert_dosage"].time():
             cursor.execute(
                 dosage_insert,
                 (
@@ -138,22 +620,23 @@ class DatabaseManager:
             )
             dosage_id = cursor.fetchone()[0]
 
-            # Parse dates - handle potential date format variations
-            date_written = self._parse_date(data.date_written)
-            patient_dob = (
-                self._parse_date(data.patient_dob) if data.patient_dob else None
-            )
+        # Parse dates - handle potential date format variations
+        date_written = self._parse_date(data.date_written)
+        patient_dob = (
+            self._parse_date(data.patient_dob) if data.patient_dob else None
+        )
 
-            # Insert prescription data
-            prescription_insert = """
-            INSERT INTO prescriptions (
-                rx_number, date_written, patient_name, patient_dob, patient_id,
-                medication_id, dosage_id, prescriber_name, prescriber_id,
-                pharmacy_name, refills, is_controlled_substance, notes
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-            """
+        # Insert prescription data
+        prescription_insert = """
+        INSERT INTO prescriptions (
+            rx_number, date_written, patient_name, patient_dob, patient_id,
+            medication_id, dosage_id, prescriber_name, prescriber_id,
+            pharmacy_name, refills, is_controlled_substance, notes
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+        """
 
+        with stage_timers["insert_prescription"].time():
             cursor.execute(
                 prescription_insert,
                 (
@@ -173,16 +656,462 @@ class DatabaseManager:
                 ),
             )
 
+    async def store_prescription_async(self, data: PrescriptionData):
+        """Store prescription data without blocking the event loop.
+
+        The blocking psycopg2 work runs in a worker thread that borrows from
+        the same connection pool, so concurrency is bounded by the pool size.
+        """
+        return await asyncio.to_thread(self.store_prescription, data)
+
+    async def store_prescriptions_async(
+        self, items: List[PrescriptionData]
+    ) -> List[Optional[str]]:
+        """Store many prescriptions without blocking the event loop."""
+        return await asyncio.to_thread(self.store_prescriptions, items)
+
+    async def store_prescription_group_async(self, items: List[PrescriptionData]):
+        """Store prescriptions in one transaction without blocking the event loop."""
+        return await asyncio.to_thread(self.store_prescription_group, items)
+
+    def get_cached_extraction(
+        self, cache_key: str, max_age: float = 0
+    ) -> Optional[Tuple[PrescriptionData, float]]:
+        """Look up a cached extraction, ignoring entries older than ``max_age``.
+
+        Returns the extraction and its age in seconds.
+        """
+        query = (
+            "SELECT data, EXTRACT(EPOCH FROM NOW() - created_at)"
+            " FROM extraction_cache WHERE cache_key = %s"
+        )
+        params = [cache_key]
+        if max_age > 0:
+            query += " AND created_at > NOW() - make_interval(secs => %s)"
+            params.append(max_age)
+
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return PrescriptionData.model_validate(row[0]), float(row[1])
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def store_cached_extraction(self, cache_key: str, data: PrescriptionData):
+        """Insert or refresh a cached extraction."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO extraction_cache (cache_key, data)
+                VALUES (%s, %s)
+                ON CONFLICT (cache_key)
+                DO UPDATE SET data = EXCLUDED.data, created_at = CURRENT_TIMESTAMP;
+                """,
+                (cache_key, data.model_dump_json()),
+            )
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def purge_cached_extractions(self, max_age: float) -> int:
+        """Delete cached extractions older than ``max_age`` seconds."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM extraction_cache
+                WHERE created_at <= NOW() - make_interval(secs => %s);
+                """,
+                (max_age,),
+            )
             conn.commit()
-            return True
+            return cursor.rowcount
 
         except Exception as e:
             conn.rollback()
             raise e
 
         finally:
-            cursor.close()
-            conn.close()
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def create_job(self, text: str) -> dict:
+        """Queue a text for extraction by the worker pool."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                f"""
+                INSERT INTO extraction_jobs (input_text)
+                VALUES (%s)
+                RETURNING {JOB_COLUMNS};
+                """,
+                (text,),
+            )
+            job = cursor.fetchone()
+            conn.commit()
+            return job
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def get_job(self, job_id: int) -> Optional[dict]:
+        """Return the job's status and result, or None if it doesn't exist."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                f"SELECT {JOB_COLUMNS} FROM extraction_jobs WHERE id = %s;", (job_id,)
+            )
+            return cursor.fetchone()
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def claim_jobs(self, limit: int, stale_after: float, max_attempts: int):
+        """Claim up to ``limit`` queued jobs for this worker.
+
+        ``FOR UPDATE SKIP LOCKED`` lets any number of workers poll the table
+        concurrently without handing the same job out twice. Jobs left running
+        for longer than ``stale_after`` seconds (e.g. by a crashed worker) are
+        claimed again until they reach ``max_attempts``.
+        """
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE extraction_jobs
+                SET status = 'failed', error = 'Exceeded maximum attempts',
+                    finished_at = NOW()
+                WHERE status = 'running'
+                  AND started_at < NOW() - make_interval(secs => %s)
+                  AND attempts >= %s;
+                """,
+                (stale_after, max_attempts),
+            )
+            cursor.execute(
+                """
+                UPDATE extraction_jobs
+                SET status = 'running', started_at = NOW(), attempts = attempts + 1
+                WHERE id IN (
+                    SELECT id FROM extraction_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'running'
+                           AND started_at < NOW() - make_interval(secs => %s)
+                           AND attempts < %s)
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, input_text, attempts;
+                """,
+                (stale_after, max_attempts, limit),
+            )
+            jobs = cursor.fetchall()
+            conn.commit()
+            return jobs
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def complete_job(self, job_id: int, data: PrescriptionData):
+        """Store the extracted prescription and mark the job done atomically."""
+        with stage_timers["db_acquire"].time():
+            conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            self._insert_prescription(cursor, data)
+            cursor.execute(
+                """
+                UPDATE extraction_jobs
+                SET status = 'done', result = %s, error = NULL, finished_at = NOW()
+                WHERE id = %s;
+                """,
+                (data.model_dump_json(), job_id),
+            )
+            with stage_timers["commit"].time():
+                conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def requeue_job(self, job_id: int, error: str):
+        """Put a job back in the queue after a failed attempt worth retrying."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE extraction_jobs
+                SET status = 'queued', error = %s, started_at = NULL
+                WHERE id = %s;
+                """,
+                (error, job_id),
+            )
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def fail_job(self, job_id: int, error: str):
+        """Mark a job as failed with the given error message."""
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE extraction_jobs
+                SET status = 'failed', error = %s, finished_at = NOW()
+                WHERE id = %s;
+                """,
+                (error, job_id),
+            )
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            raise e
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def query_prescriptions(self, limit: int = 50, **filters) -> List[dict]:
+        """Return stored prescriptions matching the filters, newest first.
+
+        Pagination is keyset based: pass the smallest ``id`` of the previous
+        page as ``cursor_id`` to continue after it. See
+        ``_build_prescription_query`` for the supported filters.
+        """
+        query, params = self._build_prescription_query(limit, **filters)
+
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(query, params)
+            return [self._prescription_record(row) for row in cursor.fetchall()]
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def prescription_stats(self, days: int = 30, top: int = 10) -> dict:
+        """Aggregate stored prescriptions for the dashboard.
+
+        Returns the total and controlled substance counts, the ``top`` most
+        prescribed medications and the number of prescriptions stored on each
+        of the last ``days`` days, all counted by the database.
+        """
+        conn = self.pool.getconn()
+        cursor = None
+
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                """
+                SELECT count(*) AS total,
+                       count(*) FILTER (WHERE is_controlled_substance) AS controlled
+                FROM prescriptions;
+                """
+            )
+            totals = cursor.fetchone()
+
+            cursor.execute(
+                """
+                SELECT m.name, count(*) AS count
+                FROM prescriptions p
+                JOIN medication_details m ON m.id = p.medication_id
+                WHERE m.name IS NOT NULL
+                GROUP BY m.name
+                ORDER BY count DESC, m.name
+                LIMIT %s;
+                """,
+                (top,),
+            )
+            by_medication = cursor.fetchall()
+
+            cursor.execute(
+                """
+                SELECT created_at::date AS day, count(*) AS count
+                FROM prescriptions
+                WHERE created_at >= CURRENT_DATE - %s
+                GROUP BY day
+                ORDER BY day;
+                """,
+                (days - 1,),
+            )
+            per_day = cursor.fetchall()
+
+            total = totals["total"]
+            return {
+                "total": total,
+                "controlled": totals["controlled"],
+                "controlled_ratio": totals["controlled"] / total if total else 0.0,
+                "by_medication": by_medication,
+                "per_day": per_day,
+            }
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+            self.pool.putconn(conn)
+
+    def _build_prescription_query(
+        self,
+        limit: int,
+        patient_id: Optional[str] = None,
+        rx_number: Optional[str] = None,
+        prescriber_id: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        medication: Optional[str] = None,
+        controlled: Optional[bool] = None,
+        cursor_id: Optional[int] = None,
+    ):
+        """Build the SQL and parameters for ``query_prescriptions``."""
+        conditions = []
+        params = []
+        for column, value in (
+            ("p.patient_id", patient_id),
+            ("p.rx_number", rx_number),
+            ("p.prescriber_id", prescriber_id),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if date_from is not None:
+            conditions.append("p.date_written >= %s")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("p.date_written <= %s")
+            params.append(date_to)
+        if medication is not None:
+            conditions.append("m.name ILIKE %s")
+            escaped = re.sub(r"([\\%_])", r"\\\1", medication)
+            params.append(f"%{escaped}%")
+        if controlled is not None:
+            conditions.append(
+                "p.is_controlled_substance"
+                if controlled
+                else "p.is_controlled_substance IS NOT TRUE"
+            )
+        if cursor_id is not None:
+            conditions.append("p.id < %s")
+            params.append(cursor_id)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+        SELECT
+            p.id, p.rx_number, p.date_written, p.patient_name, p.patient_dob,
+            p.patient_id, p.prescriber_name, p.prescriber_id, p.pharmacy_name,
+            p.refills, p.is_controlled_substance, p.notes, p.created_at,
+            m.name, m.strength, m.form, m.quantity,
+            d.frequency, d.duration, d.special_instructions
+        FROM prescriptions p
+        LEFT JOIN medication_details m ON m.id = p.medication_id
+        LEFT JOIN dosage_instructions d ON d.id = p.dosage_id
+        {where}
+        ORDER BY p.id DESC
+        LIMIT %s;
+        """
+        params.append(limit)
+        return query, params
+
+    def _prescription_record(self, row: dict) -> dict:
+        """Shape a joined prescription row like PrescriptionData."""
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "rx_number": row["rx_number"],
+            "date_written": self._format_date(row["date_written"]),
+            "patient_name": row["patient_name"],
+            "patient_dob": self._format_date(row["patient_dob"]),
+            "patient_id": row["patient_id"],
+            "medication": {
+                "name": row["name"],
+                "strength": row["strength"],
+                "form": row["form"],
+                "quantity": self._format_quantity(row["quantity"]),
+            },
+            "dosage": {
+                "frequency": row["frequency"],
+                "duration": row["duration"],
+                "special_instructions": row["special_instructions"],
+            },
+            "prescriber_name": row["prescriber_name"],
+            "prescriber_id": row["prescriber_id"],
+            "pharmacy_name": row["pharmacy_name"],
+            "refills": row["refills"],
+            "is_controlled_substance": row["is_controlled_substance"],
+            "notes": row["notes"],
+        }
 
     def _parse_date(self, date_str):
         """Parse date string into date object, handling multiple formats."""
@@ -198,3 +1127,9 @@ class DatabaseManager:
                 continue
 
         return None
+
+    def _format_date(self, value: Optional[date]) -> Optional[str]:
+        return value.isoformat() if value is not None else None
+
+    def _format_quantity(self, value: Optional[int]) -> Optional[str]:
+        return str(value) if value is not None else None
@@ -1,46 +1,293 @@
+import asyncio
 import json
+import logging
+import re
+import time
+from typing import AsyncIterator, Tuple, Union
 
 from config import settings
+from metrics import llm_events, record_input_tokens, record_token_usage, stage_timers
 from models import PrescriptionData
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from resilience import (
+    RETRYABLE_ERRORS,
+    TIMEOUT_ERRORS,
+    CircuitBreaker,
+    ResiliencePolicy,
+    UpstreamError,
+    UpstreamTimeout,
+    UpstreamUnavailable,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in English text, for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Lines that carry none of the extracted fields: contact details, street
+# addresses, signature lines and page furniture
+BOILERPLATE = re.compile(
+    r"^(?:"
+    r"(?:tel|phone|ph|fax|email|e-mail|web(?:site)?)\b.*"
+    r"|\S+@\S+\.\S+"
+    r"|(?:https?://|www\.)\S+"
+    r"|\d+\s+[\w .'-]+\s(?:st|street|ave|avenue|rd|road|blvd|boulevard|drive|"
+    r"ln|lane|suite|ste)\b.*"
+    r"|[A-Za-z .'-]+,\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?"
+    r"|(?:prescriber\s+)?signature\b.*|signed electronically\b.*|_{3,}.*"
+    r"|page \d+(?: of \d+)?"
+    r"|confidential(?:ity)?\b.*"
+    r")$",
+    re.IGNORECASE,
+)
+
+
+class ExtractionRefused(Exception):
+    """The model declined to extract data from the text."""
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def preprocess_text(text: str, max_tokens: int) -> str:
+    """Shrink a prescription text before it is sent to the model.
+
+    Whitespace is collapsed line by line, boilerplate lines are dropped and
+    the result is cut to about ``max_tokens`` tokens, at a line break where
+    possible.
+    """
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    text = "\n".join(line for line in lines if line and not BOILERPLATE.match(line))
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) > max_chars:
+        cut = text.rfind("\n", 0, max_chars + 1)
+        text = text[: cut if cut > max_chars // 2 else max_chars]
+    return text
 
 
 class TextExtractor:
     """Handles extraction of structured data from text."""
 
+    client_class = OpenAI
+
+    # Bump whenever the system prompt changes to invalidate cached extractions
+    prompt_version = "2"
+
+    # Kept byte-for-byte stable and sent first, ahead of the variable user
+    # text, so providers can serve it from their prompt cache
+    system_prompt = (
+        "You are a medical data extraction expert. Extract from the "
+        "prescription text: patient name and date of birth; medication name, "
+        "strength, form and quantity; dosage frequency, duration and special "
+        "instructions; prescriber name and ID; date written; refills; whether "
+        "it is a controlled substance; and other relevant details as notes. "
+        "Respond with a JSON object following the PrescriptionData schema."
+    )
+
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-        self.system_prompt = """
-        You are a medical data extraction expert. Extract the following information from the prescription text:
-        - Patient name and date of birth
-        - Medication name, strength, form, and quantity
-        - Dosage instructions (frequency, duration, special instructions)
-        - Prescriber name and ID
-        - Date written
-        - Refill information
-        - Whether it's a controlled substance
-        - Any other relevant prescription details
-        
-        Format the response as a JSON object following the PrescriptionData schema.
-        """
+        self.client = self.client_class(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.LLM_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        self.model = settings.OPENAI_MODEL
+        self.small_model = settings.OPENAI_SMALL_MODEL
 
-    def extract_prescription_data(self, text: str) -> PrescriptionData:
-        """Extract structured prescription data from text."""
+    def prepare(self, text: str) -> Tuple[str, str]:
+        """Preprocess ``text`` and choose the model to extract it with."""
+        prepared = text
+        if settings.PREPROCESS_ENABLED:
+            prepared = preprocess_text(text, settings.PROMPT_MAX_INPUT_TOKENS)
+        record_input_tokens(estimate_tokens(text), estimate_tokens(prepared))
+        return prepared, self.choose_model(prepared)
+
+    def choose_model(self, text: str) -> str:
+        """Send short inputs to the cheaper model tier, if one is configured."""
+        if (
+            self.small_model
+            and estimate_tokens(text) <= settings.SMALL_MODEL_MAX_INPUT_TOKENS
+        ):
+            return self.small_model
+        return self.model
+
+    def _build_messages(self, text: str):
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": text},
+        ]
+
+    def _request_options(self, text: str, model: str):
+        options = {
+            "model": model,
+            "messages": self._build_messages(text),
+            "response_format": PrescriptionData,
+        }
+        if settings.OPENAI_PROMPT_CACHE_KEY:
+            options["prompt_cache_key"] = (
+                f"{settings.OPENAI_PROMPT_CACHE_KEY}-v{self.prompt_version}"
+            )
+        return options
+
+    def _parse_response(self, raw_response, model: str, latency: float):
+        """Parse a raw API response and report its latency and token usage."""
+        with stage_timers["parse"].time():
+            response = raw_response.parse()
+
+        self._record_usage(model, response.usage, latency)
+        return self._parsed_message(response.choices[0].message)
+
+    def _parsed_message(self, message) -> PrescriptionData:
+        if message.parsed is None:
+            raise ExtractionRefused(
+                f"Model refused to extract prescription data: {message.refusal}"
+            )
+        return message.parsed
+
+    def _record_usage(self, model: str, usage, latency: float):
+        record_token_usage(model, usage)
+        if usage is not None:
+            logger.info(
+                f"Extracted with {model} in {latency:.2f}s: "
+                f"{usage.prompt_tokens} tokens in, {usage.completion_tokens} out"
+            )
+
+    def extract_prepared(self, text: str, model: str) -> PrescriptionData:
+        """Extract prescription data from text returned by ``prepare``."""
         try:
-            response = self.client.beta.chat.completions.parse(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": text},
-                ],
-                response_format=PrescriptionData,
+            # Time the API call and the structured output parsing separately
+            completions = self.client.beta.chat.completions
+            start = time.perf_counter()
+            with stage_timers["llm"].time():
+                raw_response = completions.with_raw_response.parse(
+                    **self._request_options(text, model)
+                )
+            return self._parse_response(
+                raw_response, model, time.perf_counter() - start
             )
 
-            # Get the JSON content from the response
-            parsed_data = response.choices[0].message.parsed
+        except Exception as e:
+            raise Exception(f"Error extracting prescription data: {str(e)}")
+
+    def extract_prescription_data(self, text: str) -> PrescriptionData:
+        """Extract structured prescription data from text."""
+        return self.extract_prepared(*self.prepare(text))
 
-            return parsed_data
 
+class AsyncTextExtractor(TextExtractor):
+    """Non-blocking variant of TextExtractor built on the async OpenAI client."""
+
+    client_class = AsyncOpenAI
+
+    def __init__(self):
+        super().__init__()
+        # Retries are left to the policy, which also hedges and circuit breaks
+        self.client = self.client.with_options(max_retries=0)
+        self.policy = ResiliencePolicy(
+            timeout=settings.LLM_TIMEOUT,
+            deadline=settings.LLM_DEADLINE,
+            max_retries=settings.LLM_MAX_RETRIES,
+            base_delay=settings.LLM_RETRY_BASE_DELAY,
+            max_delay=settings.LLM_RETRY_MAX_DELAY,
+            hedge_after=settings.LLM_HEDGE_AFTER,
+            breaker=CircuitBreaker(
+                settings.LLM_BREAKER_THRESHOLD,
+                settings.LLM_BREAKER_RESET,
+                window=settings.LLM_HEALTH_WINDOW,
+            ),
+        )
+
+    async def extract_prepared(self, text: str, model: str) -> PrescriptionData:
+        """Extract prescription data from prepared text without blocking.
+
+        Upstream timeouts and outages are raised as ``UpstreamError`` so
+        callers can tell them apart from bad input.
+        """
+        try:
+            completions = self.client.beta.chat.completions
+            options = self._request_options(text, model)
+            start = time.perf_counter()
+            with stage_timers["llm"].time():
+                raw_response = await self.policy.call(
+                    lambda: completions.with_raw_response.parse(**options)
+                )
+            return self._parse_response(
+                raw_response, model, time.perf_counter() - start
+            )
+
+        except (UpstreamError, ExtractionRefused):
+            raise
         except Exception as e:
             raise Exception(f"Error extracting prescription data: {str(e)}")
+
+    async def extract_prescription_data(self, text: str) -> PrescriptionData:
+        """Extract structured prescription data from text without blocking."""
+        return await self.extract_prepared(*self.prepare(text))
+
+    async def stream_prepared(
+        self, text: str, model: str
+    ) -> AsyncIterator[Union[dict, PrescriptionData]]:
+        """Stream an extraction of prepared text as the response arrives.
+
+        Yields a dict of the fields parsed so far whenever it grows, then the
+        complete ``PrescriptionData``. Streams are neither retried nor hedged,
+        as partial fields have already been passed on, but they go through
+        the circuit breaker like any other call and the whole stream has to
+        finish within the time allowed for a single attempt.
+        """
+        breaker = self.policy.breaker
+        if not breaker.allow():
+            llm_events["breaker_reject"].inc()
+            raise UpstreamUnavailable("LLM upstream unavailable, circuit breaker open")
+
+        options = self._request_options(text, model)
+        options["stream_options"] = {"include_usage": True}
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + min(self.policy.timeout, self.policy.deadline)
+        settled = False
+        try:
+            try:
+                start = time.perf_counter()
+                last = None
+                async with self.client.beta.chat.completions.stream(
+                    **options
+                ) as stream:
+                    events = stream.__aiter__()
+                    while True:
+                        try:
+                            event = await asyncio.wait_for(
+                                events.__anext__(), give_up_at - loop.time()
+                            )
+                        except StopAsyncIteration:
+                            break
+                        if event.type == "content.delta" and event.parsed:
+                            if event.parsed != last:
+                                last = event.parsed
+                                yield last
+                    completion = await asyncio.wait_for(
+                        stream.get_final_completion(), give_up_at - loop.time()
+                    )
+                stage_timers["llm"].observe(time.perf_counter() - start)
+
+            except RETRYABLE_ERRORS as e:
+                settled = True
+                breaker.record_failure()
+                if isinstance(e, TIMEOUT_ERRORS):
+                    llm_events["timeout"].inc()
+                    raise UpstreamTimeout("LLM request timed out") from e
+                raise UpstreamUnavailable(f"LLM request failed: {str(e)}") from e
+            except Exception as e:
+                raise Exception(f"Error extracting prescription data: {str(e)}")
+
+            settled = True
+            breaker.record_success()
+            self._record_usage(model, completion.usage, time.perf_counter() - start)
+            yield self._parsed_message(completion.choices[0].message)
+
+        finally:
+            # Settle the breaker, which may have let this call through as its
+            # trial, when the consumer went away or the failure was ours
+            if not settled:
+                breaker.record_success()
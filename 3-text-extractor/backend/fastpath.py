@@ -0,0 +1,229 @@
+import re
+from typing import Optional, Tuple
+
+from models import DosageInstructions, MedicationDetails, PrescriptionData
+
+# Labelled lines of the e-prescription printout layout
+LABELS = {
+    "patient_name": re.compile(r"^\s*Patient:\s*(.+?)\s*$", re.MULTILINE),
+    "patient_dob": re.compile(r"^\s*DOB:\s*(\S+)\s*$", re.MULTILINE),
+    "patient_id": re.compile(r"^\s*(?:Patient ID|MRN):\s*(\S+)\s*$", re.MULTILINE),
+    "date_written": re.compile(r"^\s*Date:\s*(\S+)\s*$", re.MULTILINE),
+    "rx_number": re.compile(r"^\s*Rx\s*#:\s*(\S+)\s*$", re.MULTILINE),
+    "dispense": re.compile(r"^\s*Disp:\s*(.+?)\s*$", re.MULTILINE),
+    "sig": re.compile(r"^\s*Sig:\s*(.+?)\s*$", re.MULTILINE),
+    "refills": re.compile(r"^\s*Refills:\s*(.+?)\s*$", re.MULTILINE),
+    "pharmacy_name": re.compile(r"^\s*Pharmacy:\s*(.+?)\s*$", re.MULTILINE),
+}
+
+PRESCRIBER = re.compile(
+    r"^\s*(Dr\.?\s+[^(\n]+?)\s*\((?:NPI|DEA)[:#]?\s*([A-Z0-9]+)\)", re.MULTILINE
+)
+
+# e.g. "Lisinopril 10mg Tablet" or "Amoxicillin 500 mg capsule"
+MEDICATION = re.compile(
+    r"^\s*([A-Z][A-Za-z-]+(?:[ /][A-Z][A-Za-z-]+)*)\s+"
+    r"(\d+(?:\.\d+)?\s*(?:mg|mcg|g|mL|ml|units?|%)(?:/\d*\s*(?:mL|ml))?)"
+    r"(?:\s+([A-Za-z]+(?:\s[A-Za-z]+)?))?\s*$",
+    re.MULTILINE,
+)
+
+FREQUENCY = re.compile(
+    r"\b(once daily|twice daily|three times daily|four times daily|"
+    r"once a day|twice a day|every \d+(?:-\d+)? hours|every (?:morning|evening)|"
+    r"at bedtime|as needed|daily|weekly|BID|TID|QID|QD|QHS|PRN)\b",
+    re.IGNORECASE,
+)
+
+DURATION = re.compile(r"\bfor (\d+\s*(?:days?|weeks?|months?))\b", re.IGNORECASE)
+
+QUANTITY = re.compile(r"^(\d+)")
+
+CONTROLLED_SUBSTANCES = {
+    "alprazolam",
+    "amphetamine",
+    "buprenorphine",
+    "clonazepam",
+    "codeine",
+    "diazepam",
+    "fentanyl",
+    "hydrocodone",
+    "hydromorphone",
+    "lorazepam",
+    "methadone",
+    "methylphenidate",
+    "morphine",
+    "oxycodone",
+    "pregabalin",
+    "tramadol",
+    "dextroamphetamine",
+    "lisdexamfetamine",
+    "phenobarbital",
+    "tapentadol",
+    "testosterone",
+    "zolpidem",
+}
+
+# Brand names of controlled substances
+CONTROLLED_BRANDS = {
+    "adderall",
+    "ambien",
+    "ativan",
+    "concerta",
+    "dilaudid",
+    "duragesic",
+    "focalin",
+    "klonopin",
+    "lyrica",
+    "norco",
+    "oxycontin",
+    "percocet",
+    "ritalin",
+    "roxicodone",
+    "suboxone",
+    "subutex",
+    "ultram",
+    "valium",
+    "vicodin",
+    "vyvanse",
+    "xanax",
+}
+
+# Common medications known not to be controlled. Any other name leaves the
+# flag uncertain, so the extraction loses confidence and goes to the LLM.
+NOT_CONTROLLED = {
+    "acetaminophen",
+    "albuterol",
+    "amlodipine",
+    "amoxicillin",
+    "atenolol",
+    "atorvastatin",
+    "azithromycin",
+    "cephalexin",
+    "cetirizine",
+    "ciprofloxacin",
+    "citalopram",
+    "clopidogrel",
+    "doxycycline",
+    "escitalopram",
+    "fluoxetine",
+    "furosemide",
+    "hydrochlorothiazide",
+    "ibuprofen",
+    "levothyroxine",
+    "lisinopril",
+    "loratadine",
+    "losartan",
+    "metformin",
+    "metoprolol",
+    "montelukast",
+    "naproxen",
+    "omeprazole",
+    "pantoprazole",
+    "prednisone",
+    "rosuvastatin",
+    "sertraline",
+    "simvastatin",
+    "tamsulosin",
+    "warfarin",
+}
+
+# Fields the LLM would be needed for if missing, and how much each one counts
+REQUIRED_FIELDS = {
+    "patient_name": 2,
+    "medication_name": 2,
+    "strength": 1,
+    "frequency": 1,
+    "date_written": 1,
+    "prescriber_name": 1,
+    # Whether the medication is controlled could be told from its name
+    "controlled_status": 1,
+    # Labelled values that are present but couldn't be parsed
+    "quantity": 1,
+    "refills": 1,
+}
+
+
+def controlled_status(medication_name: str) -> Optional[bool]:
+    """Tell from its name whether a medication is controlled.
+
+    Every word is checked, so salts and release forms such as "Morphine
+    Sulfate" or "Adderall XR" still match. ``None`` for unknown names.
+    """
+    words = set(re.findall(r"[a-z]+", medication_name.lower()))
+    if words & (CONTROLLED_SUBSTANCES | CONTROLLED_BRANDS):
+        return True
+    if words & NOT_CONTROLLED:
+        return False
+    return None
+
+
+class RuleBasedExtractor:
+    """Extracts well-formed e-prescription printouts without calling the LLM.
+
+    Each extraction is scored by the share of required fields it found, so
+    callers can fall back to the LLM when the text doesn't fit the layout.
+    """
+
+    def extract(self, text: str) -> Tuple[Optional[PrescriptionData], float]:
+        """Return the extracted data and a confidence between 0 and 1."""
+        fields = {
+            name: match.group(1)
+            for name, pattern in LABELS.items()
+            if (match := pattern.search(text))
+        }
+
+        medications = MEDICATION.findall(text)
+        if len(medications) != 1:
+            # None, or several medications that the rules can't tell apart
+            return None, 0.0
+        medication_name, strength, form = medications[0]
+
+        prescriber = PRESCRIBER.search(text)
+        sig = fields.get("sig")
+        frequency = FREQUENCY.search(sig) if sig else None
+        duration = DURATION.search(sig) if sig else None
+        dispense = fields.get("dispense")
+        quantity = QUANTITY.match(dispense) if dispense else None
+        refills = fields.get("refills")
+        controlled = controlled_status(medication_name)
+
+        found = {
+            "patient_name": "patient_name" in fields,
+            "medication_name": bool(medication_name),
+            "strength": bool(strength),
+            "frequency": frequency is not None,
+            "date_written": "date_written" in fields,
+            "prescriber_name": prescriber is not None,
+            "controlled_status": controlled is not None,
+            "quantity": dispense is None or quantity is not None,
+            "refills": refills is None or refills.isdigit(),
+        }
+        confidence = sum(
+            weight for name, weight in REQUIRED_FIELDS.items() if found[name]
+        ) / sum(REQUIRED_FIELDS.values())
+
+        data = PrescriptionData(
+            rx_number=fields.get("rx_number"),
+            date_written=fields.get("date_written"),
+            patient_name=fields.get("patient_name"),
+            patient_dob=fields.get("patient_dob"),
+            patient_id=fields.get("patient_id"),
+            medication=MedicationDetails(
+                name=medication_name,
+                strength=strength.replace(" ", ""),
+                form=form or None,
+                quantity=quantity.group(1) if quantity else None,
+            ),
+            dosage=DosageInstructions(
+                frequency=frequency.group(1) if frequency else None,
+                duration=duration.group(1) if duration else None,
+                special_instructions=sig,
+            ),
+            prescriber_name=prescriber.group(1) if prescriber else None,
+            prescriber_id=prescriber.group(2) if prescriber else None,
+            pharmacy_name=fields.get("pharmacy_name"),
+            refills=int(refills) if refills and refills.isdigit() else None,
+            is_controlled_substance=bool(controlled),
+        )
+        return data, confidence
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from database import DatabaseManager
+from resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessMonitor:
+    """Keeps a cached view of whether the service can take traffic.
+
+    Dependencies are probed in the background every ``interval`` seconds, so
+    a readiness probe only reads the last result. The database is ready when
+    a pooled connection answers a ping within ``probe_timeout`` seconds and
+    no pool checkout timed out since the previous probe. The LLM upstream is
+    ready while the circuit breaker is not rejecting calls and at least
+    ``min_llm_success`` of recent calls succeeded.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        breaker: CircuitBreaker,
+        interval: float = 5,
+        probe_timeout: float = 2,
+        min_llm_success: float = 0.5,
+    ):
+        self.db_manager = db_manager
+        self.breaker = breaker
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.min_llm_success = min_llm_success
+        self.status = {"ready": False, "checks": {}, "checked_at": None}
+        self._ping = None
+        self._pool_timeouts = None
+        self._task = None
+
+    def start(self):
+        """Start refreshing in the background on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing readiness: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self):
+        """Probe every dependency and replace the cached status."""
+        checks = {"database": await self._check_database(), "llm": self._check_llm()}
+        self.status = {
+            "ready": all(check["ok"] for check in checks.values()),
+            "checks": checks,
+            "checked_at": time.time(),
+        }
+
+    async def _check_database(self) -> dict:
+        timeouts = self.db_manager.pool.stats()["timeouts"]
+        saturated = self._pool_timeouts is not None and timeouts > self._pool_timeouts
+        self._pool_timeouts = timeouts
+
+        # A ping stuck in its thread can't be cancelled, so wait on it again
+        # instead of piling up new ones
+        if self._ping is None or self._ping.done():
+            self._ping = asyncio.ensure_future(asyncio.to_thread(self._ping_database))
+        try:
+            error = await asyncio.wait_for(
+                asyncio.shield(self._ping), self.probe_timeout
+            )
+        except asyncio.TimeoutError:
+            error = f"Ping took longer than {self.probe_timeout}s"
+
+        if error is None and saturated:
+            error = "Connection pool checkouts timed out"
+        return {"ok": error is None, "error": error}
+
+    def _ping_database(self) -> Optional[str]:
+        try:
+            self.db_manager.ping()
+            return None
+        except Exception as e:
+            return str(e)
+
+    def _check_llm(self) -> dict:
+        success_rate = self.breaker.success_rate()
+        error = None
+        if self.breaker.rejecting:
+            error = "Circuit breaker is open"
+        elif success_rate is not None and success_rate < self.min_llm_success:
+            error = f"Only {success_rate:.0%} of recent LLM calls succeeded"
+        return {"ok": error is None, "error": error, "success_rate": success_rate}
@@ -1,10 +1,33 @@
+import asyncio
+import json
 import logging
+from datetime import date
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from pydantic import ValidationError
 
+from batch import RateLimiter, run_batch
+from config import settings
 from database import DatabaseManager
-from extraction import TextExtractor
-from models import InputText, PrescriptionData
+from extraction import ExtractionRefused
+from health import ReadinessMonitor
+from metrics import StatsCollector
+from models import (
+    BatchInput,
+    BatchItemResult,
+    BatchResult,
+    InputText,
+    JobStatus,
+    PrescriptionData,
+    PrescriptionPage,
+    PrescriptionStats,
+)
+from pipeline import create_pipeline
+from resilience import UpstreamTimeout, UpstreamUnavailable
+from segmentation import split_prescriptions
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,39 +38,359 @@ app = FastAPI(title="Prescription Text Extractor")
 
 # Initialize services
 db_manager = DatabaseManager()
-text_extractor = TextExtractor()
+pipeline = create_pipeline(db_manager)
+extraction_cache = pipeline.cache
+batch_rate_limiter = RateLimiter(settings.BATCH_RATE_LIMIT)
+REGISTRY.register(StatsCollector(db_manager.pool, extraction_cache, pipeline.stats))
+readiness = ReadinessMonitor(
+    db_manager,
+    pipeline.extractor.policy.breaker,
+    interval=settings.READINESS_INTERVAL,
+    probe_timeout=settings.READINESS_PROBE_TIMEOUT,
+    min_llm_success=settings.READINESS_MIN_LLM_SUCCESS,
+)
 
 
 # Initialize database tables on startup
 @app.on_event("startup")
 async def startup_event():
     try:
-        db_manager.initialize_tables()
+        await asyncio.to_thread(db_manager.initialize_tables)
+        if extraction_cache is not None and settings.CACHE_TTL > 0:
+            await asyncio.to_thread(
+                db_manager.purge_cached_extractions, settings.CACHE_TTL
+            )
         logger.info("Application startup completed successfully")
     except Exception as e:
         logger.error(f"Error during startup: {str(e)}")
 
+    readiness.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    readiness.stop()
+    db_manager.pool.close()
+
+
+def _error_status(error: Exception) -> int:
+    """HTTP status for an extraction failure, telling outages and refusals apart."""
+    if isinstance(error, UpstreamTimeout):
+        return 504
+    if isinstance(error, UpstreamUnavailable):
+        return 503
+    if isinstance(error, ExtractionRefused):
+        return 422
+    return 500
+
 
 @app.post("/process_text/", response_model=PrescriptionData)
 async def process_text(input_text: InputText):
     """Process prescription text and extract structured data."""
     try:
         # Extract structured data from text
-        prescription_data = text_extractor.extract_prescription_data(input_text.text)
+        prescription_data = await pipeline.extract(input_text.text)
 
         # Store the extracted data in PostgreSQL
-        db_manager.store_prescription(prescription_data)
+        await db_manager.store_prescription_async(prescription_data)
 
         return prescription_data
 
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error processing prescription: {str(e)}"
+            status_code=_error_status(e),
+            detail=f"Error processing prescription: {str(e)}",
+        )
+
+
+@app.post("/process_document/", response_model=List[PrescriptionData])
+async def process_document(input_text: InputText):
+    """Extract every prescription in a document and store them together.
+
+    The document is split into one text per prescription, the parts are
+    extracted concurrently and the results stored in a single transaction,
+    so either all of them are stored or none is.
+    """
+    segments = split_prescriptions(input_text.text)
+    if len(segments) > settings.DOCUMENT_MAX_PRESCRIPTIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Document holds {len(segments)} prescriptions, more than the "
+                f"limit of {settings.DOCUMENT_MAX_PRESCRIPTIONS}"
+            ),
+        )
+
+    extracted = await run_batch(
+        segments, pipeline.extract, settings.BATCH_CONCURRENCY, batch_rate_limiter
+    )
+    for i, data in enumerate(extracted):
+        if isinstance(data, Exception):
+            raise HTTPException(
+                status_code=_error_status(data),
+                detail=f"Error processing prescription {i + 1}: {str(data)}",
+            )
+
+    try:
+        await db_manager.store_prescription_group_async(extracted)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error storing prescriptions: {str(e)}"
+        )
+
+    return extracted
+
+
+@app.post("/process_text/stream")
+async def process_text_stream(input_text: InputText):
+    """Extract prescription data, streaming fields as Server-Sent Events.
+
+    ``partial`` events carry the fields parsed so far, and the final
+    ``result`` event the complete data once it is stored. Failures end the
+    stream with an ``error`` event holding ``detail`` and ``status``.
+    """
+
+    async def events():
+        try:
+            async for data in pipeline.stream(input_text.text):
+                if isinstance(data, PrescriptionData):
+                    await db_manager.store_prescription_async(data)
+                    yield f"event: result\ndata: {data.model_dump_json()}\n\n"
+                else:
+                    yield f"event: partial\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            error = {
+                "detail": f"Error processing prescription: {str(e)}",
+                "status": _error_status(e),
+            }
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _read_batch_texts(request: Request):
+    """Read batch texts from a JSON body or an NDJSON stream.
+
+    Returns a list holding either the text or, for malformed NDJSON lines, an
+    error message, so bad lines are reported per item instead of failing.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("application/x-ndjson"):
+        items = []
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            items.extend(_parse_ndjson_line(line) for line in lines if line.strip())
+            if len(items) > settings.BATCH_MAX_ITEMS:
+                break
+        if buffer.strip():
+            items.append(_parse_ndjson_line(buffer))
+        return items
+
+    try:
+        return BatchInput.model_validate(await request.json()).texts
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch input: {str(e)}")
+
+
+def _parse_ndjson_line(line: bytes):
+    try:
+        return InputText.model_validate(json.loads(line)).text
+    except (ValueError, ValidationError) as e:
+        return ValueError(f"Invalid NDJSON line: {str(e)}")
+
+
+@app.post("/process_batch/", response_model=BatchResult)
+async def process_batch(request: Request):
+    """Extract and store many prescriptions, reporting the status of each."""
+    items = await _read_batch_texts(request)
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the limit of {settings.BATCH_MAX_ITEMS} items",
+        )
+
+    # Extract concurrently, skipping items that failed to parse
+    texts = {i: item for i, item in enumerate(items) if isinstance(item, str)}
+    extracted = await run_batch(
+        list(texts.values()),
+        pipeline.extract,
+        settings.BATCH_CONCURRENCY,
+        batch_rate_limiter,
+    )
+    outcomes = dict(zip(texts, extracted))
+    outcomes.update((i, item) for i, item in enumerate(items) if i not in texts)
+
+    # Store all successful extractions in one go
+    to_store = [
+        (i, data)
+        for i, data in sorted(outcomes.items())
+        if not isinstance(data, Exception)
+    ]
+    try:
+        store_errors = await db_manager.store_prescriptions_async(
+            [data for _, data in to_store]
+        )
+    except Exception as e:
+        logger.error(f"Error storing batch: {str(e)}")
+        store_errors = [str(e)] * len(to_store)
+    for (i, _), error in zip(to_store, store_errors):
+        if error is not None:
+            outcomes[i] = Exception(f"Error storing prescription: {error}")
+
+    results = []
+    for i in range(len(items)):
+        outcome = outcomes[i]
+        if isinstance(outcome, Exception):
+            results.append(BatchItemResult(index=i, status="error", error=str(outcome)))
+        else:
+            results.append(BatchItemResult(index=i, status="success", data=outcome))
+
+    succeeded = sum(result.status == "success" for result in results)
+    return BatchResult(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(input_text: InputText):
+    """Queue prescription text for extraction and return the job immediately."""
+    try:
+        return await asyncio.to_thread(db_manager.create_job, input_text.text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error queuing job: {str(e)}")
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: int):
+    """Report the status of a job and its result once done."""
+    job = await asyncio.to_thread(db_manager.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: int):
+    """Stream job status changes as Server-Sent Events until it finishes."""
+    job = await asyncio.to_thread(db_manager.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def events(job):
+        last_status = None
+        while True:
+            if job["status"] != last_status:
+                last_status = job["status"]
+                payload = JobStatus.model_validate(job).model_dump_json()
+                yield f"event: status\ndata: {payload}\n\n"
+            if last_status in ("done", "failed"):
+                return
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+            job = await asyncio.to_thread(db_manager.get_job, job_id)
+
+    return StreamingResponse(events(job), media_type="text/event-stream")
+
+
+@app.get("/prescriptions", response_model=PrescriptionPage)
+async def list_prescriptions(
+    patient_id: Optional[str] = None,
+    rx_number: Optional[str] = None,
+    prescriber_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    medication: Optional[str] = Query(
+        None, min_length=3, description="Substring of the medication name"
+    ),
+    controlled: Optional[bool] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(
+        None, description="`next_cursor` from the previous page"
+    ),
+):
+    """List stored prescriptions, newest first, with keyset pagination."""
+    try:
+        items = await asyncio.to_thread(
+            db_manager.query_prescriptions,
+            patient_id=patient_id,
+            rx_number=rx_number,
+            prescriber_id=prescriber_id,
+            date_from=date_from,
+            date_to=date_to,
+            medication=medication,
+            controlled=controlled,
+            limit=limit,
+            cursor_id=cursor,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error querying prescriptions: {str(e)}"
         )
 
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
 
 # Add a health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/livez")
+async def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe from cached database and LLM checks, 503 when not ready."""
+    status = readiness.status
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/stats/pool")
+async def pool_stats():
+    """Database connection pool usage and wait-time metrics."""
+    return db_manager.pool.stats()
+
+
+@app.get("/stats/cache")
+async def cache_stats():
+    """Extraction cache hit/miss counters."""
+    if extraction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **extraction_cache.stats()}
+
+
+@app.get("/stats/extraction")
+async def extraction_stats():
+    """Share and latency of extractions served by the fast path, cache and LLM."""
+    return pipeline.stats.snapshot()
+
+
+@app.get("/stats/prescriptions", response_model=PrescriptionStats)
+async def prescription_stats(
+    days: int = Query(30, ge=1, le=366, description="Days of daily volume"),
+    top: int = Query(10, ge=1, le=100, description="Medications to list"),
+):
+    """Counts by medication, controlled substance share and daily volume."""
+    try:
+        return await asyncio.to_thread(db_manager.prescription_stats, days, top)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error computing prescription stats: {str(e)}"
+        )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Stage latency histograms, token usage and service stats for Prometheus."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
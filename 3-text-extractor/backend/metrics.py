@@ -0,0 +1,204 @@
+"""Prometheus metrics for the extractor backend.
+
+Stage timings, OpenAI token usage and LLM call retries are recorded as
+requests run. The connection pool, cache and extraction path statistics
+that are already kept elsewhere are only read when ``/metrics`` is scraped.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+STAGES = (
+    "llm",
+    "parse",
+    "db_connect",
+    "db_acquire",
+    "insert_medication",
+    "insert_dosage",
+    "insert_prescription",
+    "commit",
+)
+
+STAGE_SECONDS = Histogram(
+    "extractor_stage_seconds",
+    "Time spent in each stage of extracting and storing a prescription",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+# Bind the labels once so timing a stage skips the label lookup
+stage_timers = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+OPENAI_TOKENS = Counter(
+    "extractor_openai_tokens",
+    "Tokens used by OpenAI requests",
+    ["model", "type"],
+)
+
+OPENAI_REQUESTS = Counter(
+    "extractor_openai_requests",
+    "Successful OpenAI requests",
+    ["model"],
+)
+
+INPUT_TOKENS_ESTIMATED = Counter(
+    "extractor_input_tokens_estimated",
+    "Estimated tokens of input texts before and after preprocessing",
+    ["text"],
+)
+raw_input_tokens = INPUT_TOKENS_ESTIMATED.labels("raw")
+prepared_input_tokens = INPUT_TOKENS_ESTIMATED.labels("prepared")
+
+LLM_EVENTS = Counter(
+    "extractor_llm_events",
+    "Retries, timeouts, hedged requests and circuit breaker trips of LLM calls",
+    ["event"],
+)
+llm_events = {
+    event: LLM_EVENTS.labels(event)
+    for event in (
+        "retry",
+        "timeout",
+        "hedge",
+        "hedge_win",
+        "breaker_open",
+        "breaker_reject",
+    )
+}
+
+LLM_BREAKER_OPEN = Gauge(
+    "extractor_llm_breaker_open",
+    "Whether the LLM circuit breaker is currently open",
+)
+
+DB_CONNECT_FAILURES = Counter(
+    "extractor_db_connect_failures",
+    "Failed database connection attempts",
+)
+
+
+def record_input_tokens(raw: int, prepared: int):
+    raw_input_tokens.inc(raw)
+    prepared_input_tokens.inc(prepared)
+
+
+def record_token_usage(model: str, usage):
+    """Count a request and the tokens reported in its ``usage``."""
+    OPENAI_REQUESTS.labels(model).inc()
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(model, "prompt").inc(usage.prompt_tokens)
+    OPENAI_TOKENS.labels(model, "completion").inc(usage.completion_tokens)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is not None and details.cached_tokens:
+        OPENAI_TOKENS.labels(model, "cached_prompt").inc(details.cached_tokens)
+
+
+class StatsCollector:
+    """Expose the pool, cache and extraction path statistics on scrape."""
+
+    def __init__(self, pool=None, cache=None, path_stats=None):
+        self.pool = pool
+        self.cache = cache
+        self.path_stats = path_stats
+
+    def collect(self):
+        if self.pool is not None:
+            yield from self._pool_metrics(self.pool.stats())
+        if self.cache is not None:
+            yield from self._cache_metrics(self.cache.stats())
+        if self.path_stats is not None:
+            yield from self._path_metrics(self.path_stats.snapshot())
+
+    def _pool_metrics(self, stats):
+        connections = GaugeMetricFamily(
+            "extractor_db_pool_connections",
+            "Open pooled database connections",
+            labels=["state"],
+        )
+        connections.add_metric(["idle"], stats["idle"])
+        connections.add_metric(["in_use"], stats["in_use"])
+        yield connections
+        yield GaugeMetricFamily(
+            "extractor_db_pool_max_connections",
+            "Maximum size of the connection pool",
+            value=stats["max_size"],
+        )
+
+        for name, description in (
+            ("checkouts", "Connections checked out of the pool"),
+            ("waits", "Checkouts that waited for a free connection"),
+            ("timeouts", "Checkouts that timed out"),
+            ("connections_created", "Connections opened by the pool"),
+            ("connections_closed", "Connections closed by the pool"),
+            ("health_check_failures", "Idle connections that failed a ping"),
+        ):
+            yield CounterMetricFamily(
+                f"extractor_db_pool_{name}", description, value=stats[name]
+            )
+        yield CounterMetricFamily(
+            "extractor_db_pool_wait_seconds",
+            "Total time spent waiting for a pooled connection",
+            value=stats["wait_time_total"],
+        )
+
+    def _cache_metrics(self, stats):
+        lookups = CounterMetricFamily(
+            "extractor_cache_lookups",
+            "Extraction cache lookups by result",
+            labels=["result"],
+        )
+        lookups.add_metric(["memory_hit"], stats["memory_hits"])
+        lookups.add_metric(["persistent_hit"], stats["persistent_hits"])
+        lookups.add_metric(["miss"], stats["misses"])
+        yield lookups
+        yield CounterMetricFamily(
+            "extractor_cache_errors",
+            "Persistent cache operations that failed",
+            value=stats["errors"],
+        )
+        yield CounterMetricFamily(
+            "extractor_cache_evictions",
+            "Entries evicted from the in-memory cache",
+            value=stats["evictions"],
+        )
+        yield GaugeMetricFamily(
+            "extractor_cache_memory_entries",
+            "Entries in the in-memory cache",
+            value=stats["memory_entries"],
+        )
+
+    def _path_metrics(self, snapshot):
+        count = CounterMetricFamily(
+            "extractor_extractions",
+            "Extractions by the path that produced the result",
+            labels=["path"],
+        )
+        seconds = CounterMetricFamily(
+            "extractor_extraction_seconds",
+            "Total extraction time by path",
+            labels=["path"],
+        )
+        for path, stats in snapshot["paths"].items():
+            count.add_metric([path], stats["count"])
+            seconds.add_metric([path], stats["total_seconds"])
+        yield count
+        yield seconds
@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -85,3 +86,87 @@ class PrescriptionData(BaseModel):
     notes: Optional[str] = Field(
         None, description="Any additional notes or information"
     )
+
+
+class BatchInput(BaseModel):
+    """Input data model for batch extraction."""
+
+    texts: List[str]
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single item in a batch extraction."""
+
+    index: int
+    status: str = Field(..., description="Either 'success' or 'error'")
+    data: Optional[PrescriptionData] = None
+    error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    """Per-item results of a batch extraction."""
+
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+class JobStatus(BaseModel):
+    """Status of an asynchronous extraction job."""
+
+    id: int
+    status: str = Field(
+        ..., description="One of 'queued', 'running', 'done' or 'failed'"
+    )
+    result: Optional[PrescriptionData] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class PrescriptionRecord(PrescriptionData):
+    """A prescription as stored in the database."""
+
+    id: int
+    created_at: Optional[datetime] = None
+
+
+class PrescriptionPage(BaseModel):
+    """One page of stored prescriptions."""
+
+    items: List[PrescriptionRecord]
+    next_cursor: Optional[int] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+
+
+class MedicationCount(BaseModel):
+    """Number of stored prescriptions for one medication."""
+
+    name: str
+    count: int
+
+
+class DailyCount(BaseModel):
+    """Number of prescriptions stored on one day."""
+
+    day: date
+    count: int
+
+
+class PrescriptionStats(BaseModel):
+    """Aggregates over all stored prescriptions."""
+
+    total: int
+    controlled: int
+    controlled_ratio: float = Field(
+        ..., description="Share of prescriptions for controlled substances"
+    )
+    by_medication: List[MedicationCount] = Field(
+        ..., description="Most prescribed medications, most frequent first"
+    )
+    per_day: List[DailyCount] = Field(
+        ..., description="Prescriptions stored per day, days without any omitted"
+    )
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import AsyncIterator, Optional, Union
+
+from cache import ExtractionCache, cache_key
+from config import settings
+from database import DatabaseManager
+from extraction import AsyncTextExtractor
+from fastpath import RuleBasedExtractor
+from models import PrescriptionData
+
+
+class PathStats:
+    """Counts and latencies of extractions per path taken."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            stats = self._paths.setdefault(
+                path, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def snapshot(self):
+        """Return per-path counts, share of all extractions and latency."""
+        with self._lock:
+            paths = {path: dict(stats) for path, stats in self._paths.items()}
+        total = sum(stats["count"] for stats in paths.values())
+        for stats in paths.values():
+            stats["share"] = stats["count"] / total if total else 0.0
+            stats["avg_seconds"] = stats["total_seconds"] / stats["count"]
+        return {"total": total, "paths": paths}
+
+
+class ExtractionPipeline:
+    """Runs an extraction, trying the local fast path and the cache first."""
+
+    def __init__(
+        self,
+        extractor: AsyncTextExtractor,
+        cache: Optional[ExtractionCache] = None,
+        fast_path: Optional[RuleBasedExtractor] = None,
+        min_confidence: float = 1.0,
+    ):
+        self.extractor = extractor
+        self.cache = cache
+        self.fast_path = fast_path
+        self.min_confidence = min_confidence
+        self.stats = PathStats()
+
+    async def extract(self, text: str) -> PrescriptionData:
+        """Extract structured prescription data from text."""
+        start = time.perf_counter()
+
+        if self.fast_path is not None:
+            data, confidence = self.fast_path.extract(text)
+            if data is not None and confidence >= self.min_confidence:
+                self.stats.record("fastpath", time.perf_counter() - start)
+                return data
+
+        if self.cache is None:
+            data = await self.extractor.extract_prescription_data(text)
+            self.stats.record("llm", time.perf_counter() - start)
+            return data
+
+        # Key on the text and model actually sent, after preprocessing
+        text, model = self.extractor.prepare(text)
+        key = cache_key(text, model, self.extractor.prompt_version)
+        data = await self.cache.get(key)
+        if data is not None:
+            self.stats.record("cache", time.perf_counter() - start)
+            return data
+
+        data = await self.extractor.extract_prepared(text, model)
+        await self.cache.set(key, data)
+        self.stats.record("llm", time.perf_counter() - start)
+        return data
+
+    async def stream(self, text: str) -> AsyncIterator[Union[dict, PrescriptionData]]:
+        """Extract like ``extract``, yielding partial fields from the LLM first.
+
+        Fast path and cache hits yield the complete ``PrescriptionData`` right
+        away; LLM extractions yield dicts of the fields parsed so far before
+        it.
+        """
+        start = time.perf_counter()
+
+        if self.fast_path is not None:
+            data, confidence = self.fast_path.extract(text)
+            if data is not None and confidence >= self.min_confidence:
+                self.stats.record("fastpath", time.perf_counter() - start)
+                yield data
+                return
+
+        text, model = self.extractor.prepare(text)
+        key = None
+        if self.cache is not None:
+            key = cache_key(text, model, self.extractor.prompt_version)
+            data = await self.cache.get(key)
+            if data is not None:
+                self.stats.record("cache", time.perf_counter() - start)
+                yield data
+                return
+
+        # The last item streamed is the complete extraction
+        async for data in self.extractor.stream_prepared(text, model):
+            if not isinstance(data, PrescriptionData):
+                yield data
+
+        if key is not None:
+            await self.cache.set(key, data)
+        self.stats.record("llm", time.perf_counter() - start)
+        yield data
+
+
+def create_pipeline(db_manager: DatabaseManager) -> ExtractionPipeline:
+    """Build the extraction pipeline described by the application settings."""
+    cache = None
+    if settings.CACHE_ENABLED:
+        cache = ExtractionCache(
+            db_manager, max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL
+        )
+    fast_path = RuleBasedExtractor() if settings.FASTPATH_ENABLED else None
+    return ExtractionPipeline(
+        AsyncTextExtractor(),
+        cache,
+        fast_path=fast_path,
+        min_confidence=settings.FASTPATH_MIN_CONFIDENCE,
+    )
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import openai
+
+from metrics import LLM_BREAKER_OPEN, llm_events
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Failures worth another attempt; anything else, such as a rejected request,
+# fails the same way when repeated
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+TIMEOUT_ERRORS = (asyncio.TimeoutError, openai.APITimeoutError)
+
+
+class UpstreamError(Exception):
+    """The LLM upstream could not produce a response."""
+
+
+class UpstreamTimeout(UpstreamError):
+    """The LLM upstream did not respond before the deadline."""
+
+
+class UpstreamUnavailable(UpstreamError):
+    """The LLM upstream is failing or the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fails calls fast while the upstream keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_after`` seconds. It then lets a single trial
+    call through: a success closes it again, a failure keeps it open for
+    another ``reset_after`` seconds. A threshold of zero or less disables it.
+
+    Outcomes of the last ``window`` seconds are kept for ``success_rate``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_after: float, window: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.window = window
+        self._failures = 0
+        self._opened_at = None
+        self._outcomes = deque()  # (time, succeeded) pairs, oldest on the left
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    @property
+    def rejecting(self) -> bool:
+        """Whether calls are currently failed fast, waiting for a trial."""
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self.reset_after
+        )
+
+    def success_rate(self):
+        """Share of calls in the last ``window`` seconds that succeeded.
+
+        ``None`` when there were no calls in that time.
+        """
+        self._prune(time.monotonic())
+        if not self._outcomes:
+            return None
+        return sum(succeeded for _, succeeded in self._outcomes) / len(self._outcomes)
+
+    def _record_outcome(self, succeeded: bool):
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        self._prune(now)
+
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead, letting one trial through when due."""
+        if self._opened_at is None:
+            return True
+        if time.monotonic() - self._opened_at >= self.reset_after:
+            # Re-arm before the trial so concurrent calls keep being rejected
+            self._opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        self._record_outcome(True)
+        self._failures = 0
+        if self._opened_at is not None:
+            self._opened_at = None
+            LLM_BREAKER_OPEN.set(0)
+            logger.info("LLM circuit breaker closed")
+
+    def record_failure(self):
+        self._record_outcome(False)
+        self._failures += 1
+        if self.failure_threshold <= 0 or self._failures < self.failure_threshold:
+            return
+        if self._opened_at is None:
+            llm_events["breaker_open"].inc()
+            LLM_BREAKER_OPEN.set(1)
+            logger.warning(
+                f"LLM circuit breaker opened after {self._failures} failures"
+            )
+        self._opened_at = time.monotonic()
+
+
+class ResiliencePolicy:
+    """Deadlines, retries, hedging and circuit breaking around an async call.
+
+    Each attempt gets ``timeout`` seconds, and all attempts together at most
+    ``deadline`` seconds. Retryable failures are retried up to
+    ``max_retries`` times after a random delay of up to ``base_delay``
+    doubled per attempt, capped at ``max_delay``. With ``hedge_after`` set,
+    an attempt still running after that many seconds is raced by a second
+    identical request and the first response wins.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        deadline: float,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+        hedge_after: float = 0,
+        breaker: CircuitBreaker = None,
+    ):
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker(0, 0)
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run ``request``, raising an ``UpstreamError`` once it keeps failing."""
+        if not self.breaker.allow():
+            llm_events["breaker_reject"].inc()
+            raise UpstreamUnavailable("LLM upstream unavailable, circuit breaker open")
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self._attempt(
+                    request, min(self.timeout, give_up_at - loop.time())
+                )
+            except RETRYABLE_ERRORS as e:
+                error = e
+            else:
+                self.breaker.record_success()
+                return result
+
+            if isinstance(error, TIMEOUT_ERRORS):
+                llm_events["timeout"].inc()
+            self.breaker.record_failure()
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+            if (
+                attempt == self.max_retries
+                or self.breaker.is_open
+                or loop.time() + delay >= give_up_at
+            ):
+                break
+            logger.warning(f"Retrying LLM request in {delay:.2f}s: {error!r}")
+            llm_events["retry"].inc()
+            await asyncio.sleep(delay)
+
+        if isinstance(error, TIMEOUT_ERRORS):
+            raise UpstreamTimeout("LLM request timed out") from error
+        raise UpstreamUnavailable(f"LLM request failed: {str(error)}") from error
+
+    async def _attempt(self, request: Callable[[], Awaitable[T]], timeout: float) -> T:
+        """Make one attempt, hedged once it runs longer than ``hedge_after``."""
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + timeout
+        hedge_at = loop.time() + self.hedge_after if self.hedge_after > 0 else None
+
+        primary = asyncio.ensure_future(request())
+        pending = {primary}
+        try:
+            while pending:
+                now = loop.time()
+                if now >= give_up_at:
+                    raise asyncio.TimeoutError()
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    llm_events["hedge"].inc()
+                    pending.add(asyncio.ensure_future(request()))
+
+                wake_at = give_up_at if hedge_at is None else min(give_up_at, hedge_at)
+                done, pending = await asyncio.wait(
+                    pending, timeout=wake_at - now, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            llm_events["hedge_win"].inc()
+                        return task.result()
+
+            # Every request in flight failed, report the last failure
+            raise error
+
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,85 @@
+import re
+from typing import List, Tuple
+
+from fastpath import MEDICATION
+
+# Lines that only separate one part of a document from the next
+SEPARATOR = re.compile(r"^\s*(?:-{3,}|={3,}|\*{3,})\s*$")
+
+# "Rx #: 123", "Rx: Amoxicillin 500mg" or "Rx 2" opens a new prescription
+RX_MARKER = re.compile(r"^\s*Rx\b", re.IGNORECASE)
+
+# Lines closing a document rather than a single prescription: the prescriber,
+# their identifiers, the pharmacy and the signature
+FOOTER = re.compile(
+    r"^\s*(?:$|_{3,}|Dr\.?\s|(?:prescriber|signature|signed|npi|dea|license"
+    r"|pharmacy)\b)",
+    re.IGNORECASE,
+)
+
+
+def _block_starts(lines: List[str]) -> List[int]:
+    """Return the indexes of the lines that open a prescription.
+
+    Rx lines are preferred; documents without them fall back to the
+    medication lines of the printout layout.
+    """
+    for marker in (RX_MARKER, MEDICATION):
+        starts = [i for i, line in enumerate(lines) if marker.match(line)]
+        if len(starts) > 1:
+            return starts
+    return []
+
+
+def _has_prescription(lines: List[str]) -> bool:
+    return any(RX_MARKER.match(line) or MEDICATION.match(line) for line in lines)
+
+
+def _split_footer(part: List[str]) -> Tuple[List[str], List[str]]:
+    """Split the trailing footer lines off the last part of a document."""
+    end = len(part)
+    while end > 1 and FOOTER.match(part[end - 1]):
+        end -= 1
+    # Blank lines ahead of the footer stay with the part
+    while end < len(part) and not part[end].strip():
+        end += 1
+    return part[:end], part[end:]
+
+
+def split_prescriptions(text: str) -> List[str]:
+    """Split a document holding several prescriptions into one text each.
+
+    Parts are cut at separator lines or, failing that, at each Rx or
+    medication line. Lines ahead of the first prescription, such as the
+    patient, prescriber and date, are shared and repeated in every part, so
+    each one can be extracted on its own. So are trailing prescriber,
+    pharmacy and signature lines after the last one. Text with a single
+    prescription is returned unchanged as the only part.
+    """
+    lines = text.splitlines()
+
+    separators = [i for i, line in enumerate(lines) if SEPARATOR.match(line)]
+    if separators:
+        bounds = zip([-1] + separators, separators + [len(lines)])
+        parts = [lines[start + 1 : end] for start, end in bounds]
+        parts = [part for part in parts if any(line.strip() for line in part)]
+        # A leading part without a prescription of its own is the shared header
+        header = []
+        if len(parts) > 1 and not _has_prescription(parts[0]):
+            header = parts.pop(0)
+        # and so is a trailing one
+        footer = []
+        if len(parts) > 1 and not _has_prescription(parts[-1]):
+            footer = parts.pop()
+    else:
+        starts = _block_starts(lines)
+        header = lines[: starts[0]] if starts else []
+        bounds = zip(starts, starts[1:] + [len(lines)])
+        parts = [lines[start:end] for start, end in bounds]
+        footer = []
+
+    if len(parts) < 2:
+        return [text]
+    if not footer:
+        parts[-1], footer = _split_footer(parts[-1])
+    return ["\n".join(header + part + footer).strip() for part in parts]
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Settings required by config; the tests never connect to these services
+for name in ("OPENAI_API_KEY", "DB_NAME", "DB_USER", "DB_PASS", "DB_HOST"):
+    os.environ.setdefault(name, "test")
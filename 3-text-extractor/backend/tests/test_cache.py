@@ -0,0 +1,125 @@
+import asyncio
+
+import cache
+from cache import ExtractionCache, cache_key
+from models import DosageInstructions, MedicationDetails, PrescriptionData
+
+
+def prescription(name="Lisinopril"):
+    return PrescriptionData(
+        medication=MedicationDetails(name=name), dosage=DosageInstructions()
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDatabase:
+    """Persistent tier whose rows have an age in seconds set by the test."""
+
+    def __init__(self):
+        self.rows = {}  # key -> (data, age)
+
+    def get_cached_extraction(self, key, max_age=0):
+        row = self.rows.get(key)
+        if row is None or (max_age > 0 and row[1] >= max_age):
+            return None
+        return row
+
+    def store_cached_extraction(self, key, data):
+        self.rows[key] = (data, 0.0)
+
+
+def make_cache(monkeypatch, **options):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    db = FakeDatabase()
+    return ExtractionCache(db, **options), db, clock
+
+
+def test_hit_after_set(monkeypatch):
+    extraction_cache, db, _ = make_cache(monkeypatch)
+    asyncio.run(extraction_cache.set("key", prescription()))
+
+    assert asyncio.run(extraction_cache.get("key")) == prescription()
+    assert "key" in db.rows
+    stats = extraction_cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 0)
+
+
+def test_hits_are_copies(monkeypatch):
+    extraction_cache, _, _ = make_cache(monkeypatch)
+    asyncio.run(extraction_cache.set("key", prescription()))
+
+    asyncio.run(extraction_cache.get("key")).medication.name = "Changed"
+    assert asyncio.run(extraction_cache.get("key")) == prescription()
+
+
+def test_missing_results_are_not_cached(monkeypatch):
+    extraction_cache, db, _ = make_cache(monkeypatch)
+    asyncio.run(extraction_cache.set("key", None))
+
+    assert asyncio.run(extraction_cache.get("key")) is None
+    assert db.rows == {}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    extraction_cache, db, clock = make_cache(monkeypatch, ttl=60)
+    asyncio.run(extraction_cache.set("key", prescription()))
+
+    clock.now += 59
+    assert asyncio.run(extraction_cache.get("key")) is not None
+
+    clock.now += 2
+    db.rows["key"] = (prescription(), 61)
+    assert asyncio.run(extraction_cache.get("key")) is None
+    assert extraction_cache.stats()["memory_entries"] == 0
+
+
+def test_entry_promoted_from_database_keeps_its_age(monkeypatch):
+    extraction_cache, db, clock = make_cache(monkeypatch, ttl=60)
+    db.rows["key"] = (prescription(), 50)
+
+    assert asyncio.run(extraction_cache.get("key")) is not None
+    assert extraction_cache.stats()["persistent_hits"] == 1
+
+    # Served from memory until the row itself would have expired
+    clock.now += 9
+    assert asyncio.run(extraction_cache.get("key")) is not None
+    clock.now += 2
+    del db.rows["key"]
+    assert asyncio.run(extraction_cache.get("key")) is None
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    extraction_cache, db, _ = make_cache(monkeypatch, max_entries=2)
+    for key in ("a", "b"):
+        asyncio.run(extraction_cache.set(key, prescription(key)))
+    asyncio.run(extraction_cache.get("a"))
+    asyncio.run(extraction_cache.set("c", prescription("c")))
+
+    stats = extraction_cache.stats()
+    assert (stats["memory_entries"], stats["evictions"]) == (2, 1)
+
+    db.rows.clear()
+    assert asyncio.run(extraction_cache.get("b")) is None
+    assert asyncio.run(extraction_cache.get("a")).medication.name == "a"
+    assert asyncio.run(extraction_cache.get("c")).medication.name == "c"
+
+
+def test_key_ignores_whitespace_differences():
+    assert cache_key("Rx:  Lisinopril\n10mg ", "gpt-4o", "2") == cache_key(
+        "Rx: Lisinopril 10mg", "gpt-4o", "2"
+    )
+
+
+def test_key_differs_by_model_and_prompt_version():
+    key = cache_key("Rx: Lisinopril 10mg", "gpt-4o", "2")
+    assert cache_key("Rx: Lisinopril 10mg", "gpt-4o-mini", "2") != key
+    assert cache_key("Rx: Lisinopril 10mg", "gpt-4o", "3") != key
+    assert cache_key("Rx: Metformin 500mg", "gpt-4o", "2") != key
@@ -0,0 +1,46 @@
+import psycopg2
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+class BrokenConnection:
+    """A connection the server has closed: every cursor fails."""
+
+    closed = 1
+
+    def cursor(self, cursor_factory=None):
+        raise psycopg2.InterfaceError("connection already closed")
+
+    def rollback(self):
+        raise psycopg2.InterfaceError("connection already closed")
+
+    def close(self):
+        pass
+
+
+def test_failed_cursor_returns_connection_to_pool():
+    db_manager = DatabaseManager()
+    db_manager.pool._connect = BrokenConnection
+
+    for _ in range(db_manager.pool.max_size + 1):
+        with pytest.raises(psycopg2.InterfaceError):
+            db_manager.get_job(1)
+    assert db_manager.pool.stats()["size"] == 0
+
+
+def test_pool_connects_in_a_single_attempt(monkeypatch):
+    attempts = []
+
+    def connect(**params):
+        attempts.append(params)
+        raise psycopg2.OperationalError("could not connect")
+
+    monkeypatch.setattr(database.psycopg2, "connect", connect)
+    monkeypatch.setattr(database.time, "sleep", pytest.fail)
+
+    with pytest.raises(psycopg2.OperationalError):
+        DatabaseManager().pool.getconn()
+    assert len(attempts) == 1
+    assert attempts[0]["connect_timeout"] >= 1
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from extraction import AsyncTextExtractor, ExtractionRefused
+from resilience import CircuitBreaker, UpstreamTimeout
+
+
+class FakeStream:
+    """Stands in for the SDK's chat completion stream context manager."""
+
+    def __init__(self, parsed, delay=0):
+        self.parsed = parsed
+        self.delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def __aiter__(self):
+        for i in range(3):
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(type="content.delta", parsed={"fields": i})
+
+    async def get_final_completion(self):
+        message = SimpleNamespace(parsed=self.parsed, refusal="Cannot help")
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=message)])
+
+
+def extractor_in_trial(stream):
+    """An extractor whose breaker lets its next call through as the trial."""
+    extractor = AsyncTextExtractor()
+    extractor.policy.timeout = extractor.policy.deadline = 0.1
+    completions = SimpleNamespace(stream=lambda **options: stream)
+    extractor.client = SimpleNamespace(
+        beta=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+    extractor.policy.breaker = breaker = CircuitBreaker(1, reset_after=0)
+    breaker.record_failure()
+    return extractor, breaker
+
+
+async def consume(extractor, limit=None):
+    items = []
+    stream = extractor.stream_prepared("text", "model")
+    try:
+        async for item in stream:
+            items.append(item)
+            if len(items) == limit:
+                break
+    finally:
+        await stream.aclose()
+    return items
+
+
+def test_stream_yields_partials_then_result():
+    extractor, breaker = extractor_in_trial(FakeStream("data"))
+    items = asyncio.run(consume(extractor))
+    assert items == [{"fields": 0}, {"fields": 1}, {"fields": 2}, "data"]
+    assert not breaker.is_open
+
+
+def test_refusal_raises_and_closes_breaker():
+    extractor, breaker = extractor_in_trial(FakeStream(None))
+    with pytest.raises(ExtractionRefused, match="Cannot help"):
+        asyncio.run(consume(extractor))
+    assert not breaker.is_open
+
+
+def test_consumer_disconnect_settles_trial():
+    extractor, breaker = extractor_in_trial(FakeStream("data"))
+    assert asyncio.run(consume(extractor, limit=1)) == [{"fields": 0}]
+    assert not breaker.is_open
+
+
+def test_stream_past_deadline_times_out_and_keeps_breaker_open():
+    extractor, breaker = extractor_in_trial(FakeStream("data", delay=0.06))
+    with pytest.raises(UpstreamTimeout):
+        asyncio.run(consume(extractor))
+    assert breaker.is_open
@@ -0,0 +1,67 @@
+import pytest
+
+from fastpath import RuleBasedExtractor
+
+PRINTOUT = """
+Dr. Sarah Johnson, MD (NPI: 1234567890)
+Patient: John Smith
+DOB: 05/12/1975
+Date: 2023-10-15
+Rx #: 7890123
+{medication}
+Disp: {dispense}
+Sig: Take 1 tablet by mouth once daily for 30 days
+Refills: {refills}
+"""
+
+
+def extract(medication="Lisinopril 10mg Tablet", dispense="30 tablets", refills="3"):
+    text = PRINTOUT.format(medication=medication, dispense=dispense, refills=refills)
+    return RuleBasedExtractor().extract(text)
+
+
+def test_well_formed_printout_is_fully_confident():
+    data, confidence = extract()
+    assert confidence == 1.0
+    assert data.medication.name == "Lisinopril"
+    assert data.medication.quantity == "30"
+    assert data.refills == 3
+    assert data.is_controlled_substance is False
+
+
+@pytest.mark.parametrize(
+    "medication",
+    [
+        "Oxycodone 5mg Tablet",
+        "Morphine Sulfate 15mg Tablet",
+        "Xanax 0.5mg Tablet",
+        "Adderall XR 20mg Capsule",
+    ],
+)
+def test_controlled_substances_are_flagged(medication):
+    data, confidence = extract(medication=medication)
+    assert data.is_controlled_substance is True
+    assert confidence == 1.0
+
+
+def test_unknown_medication_defers_to_llm():
+    data, confidence = extract(medication="Zorbitrex 10mg Tablet")
+    assert data is not None
+    assert confidence < 1.0
+
+
+@pytest.mark.parametrize(
+    "dispense, refills",
+    [("thirty tablets", "3"), ("30 tablets", "none")],
+)
+def test_unparseable_values_lower_confidence(dispense, refills):
+    _, confidence = extract(dispense=dispense, refills=refills)
+    assert confidence < 1.0
+
+
+def test_free_text_is_not_extracted():
+    data, confidence = RuleBasedExtractor().extract(
+        "Saw Ana today, start amoxicillin three times a day."
+    )
+    assert data is None
+    assert confidence == 0.0
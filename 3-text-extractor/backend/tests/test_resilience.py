@@ -0,0 +1,165 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+import resilience
+from resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+    UpstreamTimeout,
+    UpstreamUnavailable,
+)
+
+
+def connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "http://llm"))
+
+
+class FakeRequest:
+    """Coroutine factory answering with each outcome in turn.
+
+    An outcome is either an exception to raise or a ``(delay, result)``
+    pair; the last one repeats once the others are used up.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        delay, result = outcome
+        await asyncio.sleep(delay)
+        return result
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def policy(**options):
+    defaults = {
+        "timeout": 1,
+        "deadline": 5,
+        "max_retries": 2,
+        "base_delay": 0,
+        "max_delay": 0,
+    }
+    return ResiliencePolicy(**{**defaults, **options})
+
+
+def test_retryable_error_is_retried_until_success():
+    request = FakeRequest(connection_error(), (0, "ok"))
+    assert asyncio.run(policy().call(request)) == "ok"
+    assert request.calls == 2
+
+
+def test_non_retryable_error_is_raised_right_away():
+    request = FakeRequest(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        asyncio.run(policy().call(request))
+    assert request.calls == 1
+
+
+def test_retries_give_up_as_unavailable():
+    request = FakeRequest(connection_error())
+    with pytest.raises(UpstreamUnavailable):
+        asyncio.run(policy(max_retries=2).call(request))
+    assert request.calls == 3
+
+
+def test_deadline_cuts_off_retries():
+    request = FakeRequest((1, "late"))
+    start = time.monotonic()
+    with pytest.raises(UpstreamTimeout):
+        asyncio.run(policy(timeout=0.05, deadline=0.12, max_retries=10).call(request))
+    assert time.monotonic() - start < 0.5
+    assert request.calls <= 3
+
+
+def test_slow_attempt_is_hedged_and_first_response_wins():
+    request = FakeRequest((1, "primary"), (0, "hedge"))
+    start = time.monotonic()
+    assert asyncio.run(policy(hedge_after=0.02).call(request)) == "hedge"
+    assert time.monotonic() - start < 0.5
+    assert request.calls == 2
+
+
+def test_fast_attempt_is_not_hedged():
+    request = FakeRequest((0, "primary"), (0, "hedge"))
+    assert asyncio.run(policy(hedge_after=0.5).call(request)) == "primary"
+    assert request.calls == 1
+
+
+def test_breaker_opens_at_threshold_and_rejects_calls():
+    breaker = CircuitBreaker(failure_threshold=3, reset_after=30)
+    failing = policy(max_retries=0, breaker=breaker)
+    request = FakeRequest(connection_error())
+
+    for _ in range(3):
+        with pytest.raises(UpstreamUnavailable):
+            asyncio.run(failing.call(request))
+    assert breaker.is_open and breaker.rejecting
+
+    with pytest.raises(UpstreamUnavailable, match="circuit breaker open"):
+        asyncio.run(failing.call(request))
+    assert request.calls == 3
+
+
+def test_breaker_stays_closed_below_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_after=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_breaker_allows_exactly_one_trial_after_reset(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=30)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed trial keeps it open for another reset period
+    breaker.record_failure()
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow() and breaker.allow()
+
+
+def test_success_rate_only_counts_recent_calls(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    breaker = CircuitBreaker(failure_threshold=0, reset_after=30, window=60)
+    assert breaker.success_rate() is None
+
+    breaker.record_failure()
+    clock.now += 30
+    breaker.record_success()
+    assert breaker.success_rate() == 0.5
+
+    clock.now += 31
+    assert breaker.success_rate() == 1.0
+    assert not breaker.is_open
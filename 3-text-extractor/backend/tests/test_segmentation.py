@@ -0,0 +1,48 @@
+from segmentation import split_prescriptions
+
+HEADER = "Patient: John Smith\nDOB: 05/12/1975"
+FOOTER = "Prescriber: Dr. Sarah Johnson (NPI: 1234567890)\nSignature: ________"
+
+
+def test_single_prescription_is_unchanged():
+    text = f"{HEADER}\nRx: Lisinopril 10mg Tablet\nSig: once daily\n{FOOTER}"
+    assert split_prescriptions(text) == [text]
+
+
+def test_header_and_footer_are_shared_between_rx_parts():
+    text = (
+        f"{HEADER}\n"
+        "Rx: Lisinopril 10mg Tablet\nSig: once daily\n"
+        "Rx: Metformin 500mg Tablet\nSig: twice daily\n"
+        f"{FOOTER}\n"
+    )
+    parts = split_prescriptions(text)
+    assert parts == [
+        f"{HEADER}\nRx: Lisinopril 10mg Tablet\nSig: once daily\n{FOOTER}",
+        f"{HEADER}\nRx: Metformin 500mg Tablet\nSig: twice daily\n{FOOTER}",
+    ]
+
+
+def test_trailing_part_without_prescription_is_shared():
+    text = (
+        f"{HEADER}\n---\n"
+        "Lisinopril 10mg Tablet\nSig: once daily\n---\n"
+        "Metformin 500mg Tablet\nSig: twice daily\n---\n"
+        f"{FOOTER}"
+    )
+    parts = split_prescriptions(text)
+    assert len(parts) == 2
+    assert all(part.startswith(HEADER) for part in parts)
+    assert all(part.endswith(FOOTER) for part in parts)
+    assert "Metformin" not in parts[0]
+    assert "Lisinopril" not in parts[1]
+
+
+def test_footer_after_last_separated_part_is_shared():
+    text = (
+        "Rx: Lisinopril 10mg Tablet\nSig: once daily\n---\n"
+        f"Rx: Metformin 500mg Tablet\nSig: twice daily\n\n{FOOTER}"
+    )
+    parts = split_prescriptions(text)
+    assert parts[0] == f"Rx: Lisinopril 10mg Tablet\nSig: once daily\n{FOOTER}"
+    assert parts[1] == f"Rx: Metformin 500mg Tablet\nSig: twice daily\n\n{FOOTER}"
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+from prometheus_client import REGISTRY, start_http_server
+
+from config import settings
+from database import DatabaseManager
+from metrics import StatsCollector
+from pipeline import create_pipeline
+from resilience import UpstreamError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def process_job(db_manager, pipeline, job_id, text, attempts):
+    """Extract and store a single job, recording failures on the job.
+
+    Upstream failures are transient, so the job goes back in the queue until
+    it has been attempted ``JOB_MAX_ATTEMPTS`` times. Any other error fails
+    it right away.
+    """
+    try:
+        prescription_data = await pipeline.extract(text)
+        await asyncio.to_thread(db_manager.complete_job, job_id, prescription_data)
+        logger.info(f"Job {job_id} done")
+        return
+    except UpstreamError as e:
+        error = e
+        retry = attempts < settings.JOB_MAX_ATTEMPTS
+    except Exception as e:
+        error = e
+        retry = False
+
+    try:
+        if retry:
+            logger.warning(f"Job {job_id} attempt {attempts} failed: {str(error)}")
+            await asyncio.to_thread(db_manager.requeue_job, job_id, str(error))
+        else:
+            logger.error(f"Job {job_id} failed: {str(error)}")
+            await asyncio.to_thread(db_manager.fail_job, job_id, str(error))
+    except Exception as e:
+        # Left running, the job is picked up again once it goes stale
+        logger.error(f"Error recording failure of job {job_id}: {str(e)}")
+
+
+async def run_poller(db_manager, pipeline, concurrency):
+    """Claim jobs for every free slot in one query and process them concurrently.
+
+    The queue is polled again as soon as a job finishes, or every
+    ``JOB_POLL_INTERVAL`` seconds while slots are free.
+    """
+    running = set()
+    try:
+        while True:
+            free = concurrency - len(running)
+            jobs = []
+            if free:
+                try:
+                    jobs = await asyncio.to_thread(
+                        db_manager.claim_jobs,
+                        free,
+                        settings.JOB_STALE_AFTER,
+                        settings.JOB_MAX_ATTEMPTS,
+                    )
+                except Exception as e:
+                    logger.error(f"Error claiming jobs: {str(e)}")
+
+            for job_id, text, attempts in jobs:
+                running.add(
+                    asyncio.create_task(
+                        process_job(db_manager, pipeline, job_id, text, attempts)
+                    )
+                )
+
+            if running:
+                _, running = await asyncio.wait(
+                    running,
+                    timeout=settings.JOB_POLL_INTERVAL,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            else:
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+    finally:
+        for task in running:
+            task.cancel()
+
+
+async def main():
+    db_manager = DatabaseManager()
+    await asyncio.to_thread(db_manager.initialize_tables)
+    pipeline = create_pipeline(db_manager)
+
+    if settings.WORKER_METRICS_PORT:
+        REGISTRY.register(
+            StatsCollector(db_manager.pool, pipeline.cache, pipeline.stats)
+        )
+        start_http_server(settings.WORKER_METRICS_PORT)
+
+    logger.info(f"Worker started with {settings.WORKER_CONCURRENCY} slots")
+    try:
+        await run_poller(db_manager, pipeline, settings.WORKER_CONCURRENCY)
+    finally:
+        db_manager.pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Compare per-row and bulk prescription inserts against a local Postgres.
+
+Uses the same DB_* environment variables as the backend:
+
+    python bulk_insert.py --rows 5000 --chunk-sizes 100 500 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from database import DatabaseManager  # noqa: E402
+from models import DosageInstructions, MedicationDetails, PrescriptionData  # noqa: E402
+
+
+def make_prescriptions(count):
+    return [
+        PrescriptionData(
+            rx_number=f"RX{i:07d}",
+            date_written="2023-10-15",
+            patient_name=f"Patient {i}",
+            patient_dob="05/12/1975",
+            patient_id=f"P{i % 1000:04d}",
+            medication=MedicationDetails(
+                name="Lisinopril", strength="10mg", form="Tablet", quantity="30"
+            ),
+            dosage=DosageInstructions(
+                frequency="once daily",
+                duration="30 days",
+                special_instructions="Take by mouth",
+            ),
+            prescriber_name="Dr. Sarah Johnson, MD",
+            prescriber_id="1234567890",
+            refills=3,
+            is_controlled_substance=False,
+        )
+        for i in range(count)
+    ]
+
+
+def report(label, rows, elapsed):
+    print(f"{label:<28} {rows:>7} rows  {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize_tables()
+    prescriptions = make_prescriptions(args.rows)
+
+    start = time.perf_counter()
+    for data in prescriptions:
+        db_manager.store_prescription(data)
+    report("store_prescription", args.rows, time.perf_counter() - start)
+
+    for chunk_size in args.chunk_sizes:
+        start = time.perf_counter()
+        errors = db_manager.store_prescriptions(prescriptions, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        failed = sum(error is not None for error in errors)
+        if failed:
+            print(f"  {failed} rows failed, e.g. {next(e for e in errors if e)}")
+        report(f"store_prescriptions({chunk_size})", args.rows, elapsed)
+
+    db_manager.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Concurrency load test for the /process_text/ endpoint.
+
+Fires a fixed number of requests at each concurrency level and reports
+throughput and latency percentiles. Every request sends a new synthetic
+text, so results aren't skewed by the extraction cache:
+
+    python load_test.py --url http://localhost:8000 --requests 200 --concurrency 1 10 50 200
+
+``--freeform-share`` is the share of texts that need the LLM; the rest use
+the printout layout that the rule-based fast path extracts locally.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+from synthetic import iter_texts
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_level(client, url, texts, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(text):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    f"{url}/process_text/", json={"text": text}
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50, p95, p99 = (percentile(latencies, f) * 1000 for f in (0.50, 0.95, 0.99))
+    print(
+        f"concurrency={concurrency:<5} requests={len(texts):<6} errors={errors:<4} "
+        f"throughput={len(latencies) / elapsed:8.2f} req/s  "
+        f"p50={p50:8.1f} ms  p95={p95:8.1f} ms  p99={p99:8.1f} ms"
+    )
+
+
+async def run_levels(url, total, concurrency_levels, texts):
+    """Run ``total`` requests at each level, taking new texts from ``texts``."""
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        for concurrency in concurrency_levels:
+            level_texts = list(itertools.islice(texts, total))
+            await run_level(client, url, level_texts, concurrency)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--freeform-share", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    texts = iter_texts(args.freeform_share, args.seed)
+    asyncio.run(run_levels(args.url, args.requests, args.concurrency, texts))
+
+
+if __name__ == "__main__":
+    main()
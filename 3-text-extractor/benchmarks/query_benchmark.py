@@ -0,0 +1,135 @@
+"""EXPLAIN the prescription query API on a large synthetic dataset.
+
+Seeds the tables with synthetic rows (use a scratch database, the rows are
+not removed), then runs EXPLAIN ANALYZE for each filter the
+GET /prescriptions endpoint supports and reports whether an index is used:
+
+    python query_benchmark.py --seed 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from database import DatabaseManager  # noqa: E402
+
+SEED_SQL = """
+INSERT INTO medication_details (name, strength, form, quantity)
+SELECT
+    (ARRAY['Lisinopril', 'Metformin', 'Atorvastatin', 'Amoxicillin', 'Oxycodone',
+           'Alprazolam', 'Levothyroxine', 'Amlodipine', 'Omeprazole',
+           'Sertraline'])[1 + i %% 10] || ' ' || (i %% 97),
+    (5 * (1 + i %% 20)) || 'mg', 'Tablet', 30
+FROM generate_series(1, %(rows)s) AS i;
+
+INSERT INTO dosage_instructions (frequency, duration, special_instructions)
+SELECT 'once daily', '30 days', 'Take with food'
+FROM generate_series(1, %(rows)s);
+
+INSERT INTO prescriptions (
+    rx_number, date_written, patient_name, patient_dob, patient_id,
+    medication_id, dosage_id, prescriber_name, prescriber_id,
+    refills, is_controlled_substance
+)
+SELECT
+    'RX' || lpad(i::text, 9, '0'),
+    DATE '2015-01-01' + (i %% 3650),
+    'Patient ' || (i %% 200000),
+    DATE '1950-01-01' + (i %% 20000),
+    'P' || (i %% 200000),
+    m.base + i, d.base + i,
+    'Dr. Prescriber ' || (i %% 5000),
+    lpad((i %% 5000)::text, 10, '0'),
+    i %% 6,
+    i %% 10 IN (4, 5)
+FROM generate_series(1, %(rows)s) AS i,
+     (SELECT max(id) - %(rows)s AS base FROM medication_details) AS m,
+     (SELECT max(id) - %(rows)s AS base FROM dosage_instructions) AS d;
+
+ANALYZE medication_details;
+ANALYZE dosage_instructions;
+ANALYZE prescriptions;
+"""
+
+QUERIES = {
+    "patient_id": {"patient_id": "P4242"},
+    "rx_number": {"rx_number": "RX000424242"},
+    "prescriber_id": {"prescriber_id": "0000001234"},
+    "date range": {"date_from": date(2020, 1, 1), "date_to": date(2020, 1, 31)},
+    "medication name": {"medication": "Oxycodone 4"},
+    "controlled": {"controlled": True},
+    "patient_id, page 2": {"patient_id": "P4242", "cursor_id": 500000},
+}
+
+
+def explain(db_manager, filters, limit):
+    """Return the EXPLAIN ANALYZE plan of the query behind ``filters``."""
+    query, params = db_manager._build_prescription_query(limit, **filters)
+    conn = db_manager.pool.getconn()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params)
+        return [row[0] for row in cursor.fetchall()]
+
+    finally:
+        cursor.close()
+        db_manager.pool.putconn(conn)
+
+
+def index_name(plan_line):
+    """Name of the index scanned by a plan line, if any."""
+    if "Index" not in plan_line:
+        return None
+    for marker in (" using ", "Bitmap Index Scan on "):
+        if marker in plan_line:
+            return plan_line.split(marker, 1)[1].split()[0]
+    return None
+
+
+def seed(db_manager, rows):
+    conn = db_manager.pool.getconn()
+    cursor = conn.cursor()
+
+    try:
+        start = time.perf_counter()
+        cursor.execute(SEED_SQL, {"rows": rows})
+        conn.commit()
+        print(f"Seeded {rows} prescriptions in {time.perf_counter() - start:.1f}s")
+
+    finally:
+        cursor.close()
+        db_manager.pool.putconn(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Synthetic rows to insert first"
+    )
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--verbose", action="store_true", help="Print full plans")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.initialize_tables()
+    if args.seed:
+        seed(db_manager, args.seed)
+
+    for name, filters in QUERIES.items():
+        plan = explain(db_manager, filters, args.limit)
+        execution = next(line for line in plan if line.startswith("Execution Time"))
+        indexes = sorted(filter(None, map(index_name, plan)))
+        print(f"{name:<22} {execution:<28} indexes: {', '.join(indexes) or 'none'}")
+        if args.verbose:
+            print("\n".join(f"    {line}" for line in plan))
+
+    db_manager.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Run the load test against the backend at several uvicorn worker counts.
+
+Starts the LLM stub, then for each worker count starts the backend against
+it and drives every concurrency level of load_test.py:
+
+    python run_suite.py --workers 1 2 4 --concurrency 1 10 50 200 --requests 500
+
+The backend stores results in the Postgres database described by the
+``DB_*`` variables, which should point at a local, disposable database.
+The extraction cache is disabled unless ``--cache`` is given, so every
+worker count does the same work.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from load_test import run_levels
+from synthetic import iter_texts
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(BENCHMARKS_DIR, os.pardir, "backend")
+
+
+def start_server(app, port, cwd, env, workers=1):
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            app,
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=cwd,
+        env=env,
+    )
+
+
+def wait_until_ready(url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server for {url} exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=1).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--freeform-share", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-latency", type=float, default=1.0)
+    parser.add_argument("--stub-jitter", type=float, default=0.2)
+    parser.add_argument("--stub-port", type=int, default=9000)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache", action="store_true")
+    args = parser.parse_args()
+
+    stub_env = dict(
+        os.environ,
+        STUB_LATENCY=str(args.stub_latency),
+        STUB_JITTER=str(args.stub_jitter),
+    )
+    backend_env = dict(
+        os.environ,
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "stub"),
+        OPENAI_BASE_URL=f"http://localhost:{args.stub_port}/v1",
+        CACHE_ENABLED=str(args.cache).lower(),
+    )
+
+    stub = start_server("stub_llm:app", args.stub_port, BENCHMARKS_DIR, stub_env)
+    try:
+        wait_until_ready(f"http://localhost:{args.stub_port}/docs", stub)
+        texts = iter_texts(args.freeform_share, args.seed)
+        url = f"http://localhost:{args.port}"
+
+        for workers in args.workers:
+            print(f"--- backend with {workers} uvicorn worker(s)")
+            backend = start_server(
+                "main:app", args.port, BACKEND_DIR, backend_env, workers
+            )
+            try:
+                wait_until_ready(f"{url}/health", backend)
+                asyncio.run(
+                    run_levels(url, args.requests, args.concurrency, texts)
+                )
+            finally:
+                stop_server(backend)
+    finally:
+        stop_server(stub)
+
+
+if __name__ == "__main__":
+    main()
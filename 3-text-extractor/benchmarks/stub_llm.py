@@ -0,0 +1,116 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Returns a fixed, schema-valid PrescriptionData payload after a configurable
+delay so the backend can be load tested without calling OpenAI. Each delay
+is drawn uniformly from ``STUB_LATENCY`` +/- ``STUB_JITTER`` seconds:
+
+    STUB_LATENCY=1.5 STUB_JITTER=0.5 uvicorn stub_llm:app --port 9000
+
+and start the backend with ``OPENAI_BASE_URL=http://localhost:9000/v1``.
+Streamed requests get the payload in ``STUB_STREAM_CHUNKS`` pieces spread
+over the same delay.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "1.0"))
+STUB_JITTER = float(os.getenv("STUB_JITTER", "0"))
+STUB_STREAM_CHUNKS = int(os.getenv("STUB_STREAM_CHUNKS", "20"))
+
+PRESCRIPTION = {
+    "rx_number": "7890123",
+    "date_written": "2023-10-15",
+    "patient_name": "John Smith",
+    "patient_dob": "05/12/1975",
+    "patient_id": None,
+    "medication": {
+        "name": "Lisinopril",
+        "strength": "10mg",
+        "form": "Tablet",
+        "quantity": "30",
+    },
+    "dosage": {
+        "frequency": "once daily",
+        "duration": None,
+        "special_instructions": "Take 1 tablet by mouth for hypertension",
+    },
+    "prescriber_name": "Dr. Sarah Johnson, MD",
+    "prescriber_id": "1234567890",
+    "pharmacy_name": None,
+    "refills": 3,
+    "is_controlled_substance": False,
+    "notes": None,
+}
+
+USAGE = {"prompt_tokens": 250, "completion_tokens": 120, "total_tokens": 370}
+
+app = FastAPI(title="Stub LLM")
+
+
+def _delay():
+    return max(STUB_LATENCY + random.uniform(-1, 1) * STUB_JITTER, 0)
+
+
+async def _stream_chunks(body):
+    """Yield the payload as chat.completion.chunk Server-Sent Events."""
+    content = json.dumps(PRESCRIPTION)
+    size = -(-len(content) // STUB_STREAM_CHUNKS)
+    pieces = [content[i : i + size] for i in range(0, len(content), size)]
+    base = {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+    }
+
+    delay = _delay() / len(pieces)
+    for i, piece in enumerate(pieces):
+        await asyncio.sleep(delay)
+        delta = {"content": piece}
+        if i == 0:
+            delta["role"] = "assistant"
+        choice = {"index": 0, "delta": delta, "finish_reason": None}
+        yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+
+    choice = {"index": 0, "delta": {}, "finish_reason": "stop"}
+    yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+    if (body.get("stream_options") or {}).get("include_usage"):
+        yield f"data: {json.dumps({**base, 'choices': [], 'usage': USAGE})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if body.get("stream"):
+        return StreamingResponse(_stream_chunks(body), media_type="text/event-stream")
+
+    await asyncio.sleep(_delay())
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": json.dumps(PRESCRIPTION),
+                    "refusal": None,
+                },
+                "logprobs": None,
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": USAGE,
+    }
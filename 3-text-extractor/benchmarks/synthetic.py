@@ -0,0 +1,121 @@
+"""Synthetic prescription texts for load testing the backend.
+
+Texts come in two styles: ``printout`` follows the labelled e-prescription
+layout that the backend's rule-based fast path extracts locally, while
+``freeform`` is a narrative note that has to go to the LLM. Names, numbers
+and dates vary from text to text, so runs don't hit the extraction cache.
+
+Print texts as NDJSON, ready for ``POST /process_batch/``:
+
+    python synthetic.py --count 1000 --freeform-share 0.5 --seed 1 > texts.ndjson
+"""
+
+import argparse
+import itertools
+import json
+import random
+from datetime import date, timedelta
+
+FIRST_NAMES = [
+    "John", "Maria", "Wei", "Aisha", "Carlos", "Emily", "Olga", "Raj",
+    "Fatima", "Liam", "Sofia", "Kenji", "Grace", "Omar", "Hannah", "Diego",
+]  # fmt: skip
+
+LAST_NAMES = [
+    "Smith", "Garcia", "Chen", "Khan", "Rodriguez", "Johnson", "Ivanova",
+    "Patel", "Hassan", "Murphy", "Rossi", "Tanaka", "Okafor", "Nguyen",
+]  # fmt: skip
+
+# (name, strength, form)
+MEDICATIONS = [
+    ("Lisinopril", "10mg", "Tablet"),
+    ("Metformin", "500mg", "Tablet"),
+    ("Amoxicillin", "500mg", "Capsule"),
+    ("Atorvastatin", "20mg", "Tablet"),
+    ("Sertraline", "50mg", "Tablet"),
+    ("Omeprazole", "20mg", "Capsule"),
+    ("Albuterol", "90mcg", "Inhaler"),
+    ("Levothyroxine", "75mcg", "Tablet"),
+    ("Oxycodone", "5mg", "Tablet"),
+    ("Alprazolam", "0.5mg", "Tablet"),
+]
+
+FREQUENCIES = [
+    ("once daily", "one tablet every day"),
+    ("twice daily", "one in the morning and one at night"),
+    ("three times daily", "one with each meal"),
+    ("every 6 hours as needed", "one every six hours when needed"),
+    ("at bedtime", "one before going to sleep"),
+]
+
+PHARMACIES = ["CVS Pharmacy", "Walgreens", "Rite Aid", "Main Street Pharmacy"]
+
+
+def _person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _date(rng, start_year, end_year):
+    start = date(start_year, 1, 1)
+    return start + timedelta(days=rng.randrange((date(end_year, 1, 1) - start).days))
+
+
+def generate_text(rng, style="freeform"):
+    """Return one synthetic prescription text in the given style."""
+    patient = _person(rng)
+    prescriber = f"Dr. {_person(rng)}, MD"
+    npi = rng.randrange(10**9, 10**10)
+    dob = _date(rng, 1930, 2015)
+    written = _date(rng, 2020, 2025)
+    rx_number = rng.randrange(10**6, 10**7)
+    name, strength, form = rng.choice(MEDICATIONS)
+    frequency, frequency_prose = rng.choice(FREQUENCIES)
+    days = rng.choice([7, 10, 14, 30, 90])
+    quantity = rng.choice([14, 20, 30, 60, 90])
+    refills = rng.randrange(0, 6)
+
+    if style == "printout":
+        return (
+            f"{prescriber} (NPI: {npi})\n"
+            f"Patient: {patient}\n"
+            f"DOB: {dob:%m/%d/%Y}\n"
+            f"Date: {written:%Y-%m-%d}\n"
+            f"Rx #: {rx_number}\n"
+            f"{name} {strength} {form}\n"
+            f"Disp: {quantity} {form.lower()}s\n"
+            f"Sig: Take 1 {form.lower()} by mouth {frequency} for {days} days\n"
+            f"Refills: {refills}\n"
+        )
+
+    return (
+        f"On {written:%B %d, %Y} I saw {patient} (born {dob:%B %d, %Y}) and "
+        f"am prescribing {name.lower()} {strength} {form.lower()}s, {quantity} "
+        f"in total. The patient should take {frequency_prose} for {days} days. "
+        f"{refills} refill{'s' if refills != 1 else ''} allowed, prescription "
+        f"number {rx_number}, to be filled at {rng.choice(PHARMACIES)}.\n"
+        f"-- {prescriber}, NPI {npi}"
+    )
+
+
+def iter_texts(freeform_share=1.0, seed=None):
+    """Yield texts endlessly, a ``freeform_share`` of them in freeform style."""
+    rng = random.Random(seed)
+    while True:
+        style = "freeform" if rng.random() < freeform_share else "printout"
+        yield generate_text(rng, style)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--freeform-share", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    texts = iter_texts(args.freeform_share, args.seed)
+    for text in itertools.islice(texts, args.count):
+        print(json.dumps({"text": text}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import csv
+import io
+import json
 import os
-from datetime import datetime
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import altair as alt
 import pandas as pd
@@ -8,6 +14,13 @@ import streamlit as st
 
 # Configuration
 backend_url = os.getenv("BACKEND_URL", "http://backend_api:8000")
+extraction_timeout = float(os.getenv("EXTRACTION_TIMEOUT", "300"))
+job_poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+stats_ttl = float(os.getenv("STATS_TTL", "30"))
+health_check_interval = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+stream_extraction = os.getenv("STREAM_EXTRACTION", "true").lower() == "true"
+upload_batch_size = int(os.getenv("UPLOAD_BATCH_SIZE", "25"))
+upload_concurrency = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
 st.set_page_config(
     page_title="Prescription Data Extractor",
     page_icon="💊",
@@ -58,42 +71,85 @@ st.markdown(
 )
 
 # Session state initialization
-if "prescription_history" not in st.session_state:
-    st.session_state.prescription_history = []
 if "current_prescription" not in st.session_state:
     st.session_state.current_prescription = None
-if "backend_status" not in st.session_state:
-    st.session_state.backend_status = None
 
 
-def check_backend_health():
-    """Check if the backend API is accessible."""
-    try:
-        response = requests.get(f"{backend_url}/health", timeout=5)
-        if response.status_code == 200:
-            return True
-        return False
-    except requests.RequestException:
-        return False
+@st.cache_resource
+def get_session():
+    """HTTP session shared by all sessions, keeping backend connections alive."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HealthMonitor:
+    """Checks the backend health in a background thread.
+
+    Reruns read the last result instead of waiting on a request, so a down
+    backend no longer stalls every interaction.
+    """
+
+    def __init__(self, session, interval):
+        self.session = session
+        self.interval = interval
+        # None until the first check completes
+        self.healthy = None
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+
+    def _run(self):
+        while True:
+            self.healthy = self.check()
+            time.sleep(self.interval)
+
+    def check(self):
+        """Check if the backend API is accessible."""
+        try:
+            response = self.session.get(
+                f"{backend_url}/health", timeout=min(self.interval, 5)
+            )
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+
+@st.cache_resource
+def get_health_monitor():
+    """Health monitor shared by all sessions."""
+    return HealthMonitor(get_session(), health_check_interval)
+
+
+def wait_for_job(job):
+    """Poll a backend job until it finishes, returning the final job state."""
+    deadline = time.monotonic() + extraction_timeout
+    while job["status"] not in ("done", "failed"):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for job {job['id']}")
+        time.sleep(job_poll_interval)
+        response = get_session().get(f"{backend_url}/jobs/{job['id']}", timeout=10)
+        response.raise_for_status()
+        job = response.json()
+    return job
 
 
 def process_prescription(text):
     """Send text to backend for processing and return structured data."""
     try:
-        response = requests.post(
-            f"{backend_url}/process_text/", json={"text": text}, timeout=10
+        response = get_session().post(
+            f"{backend_url}/jobs", json={"text": text}, timeout=10
         )
 
-        if response.status_code == 200:
-            prescription_data = response.json()
+        if response.status_code == 202:
+            job = wait_for_job(response.json())
+            if job["status"] == "failed":
+                return None, f"Error: {job['error']}"
+            prescription_data = job["result"]
 
-            # Add to history
-            st.session_state.prescription_history.append(
-                {
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "data": prescription_data,
-                }
-            )
+            # Include the new prescription in the history stats
+            fetch_prescription_stats.clear()
 
             # Set as current prescription
             st.session_state.current_prescription = prescription_data
@@ -103,6 +159,54 @@ def process_prescription(text):
             error_msg = f"Error: {response.status_code} - {response.text}"
             return None, error_msg
 
+    except requests.RequestException as e:
+        return None, f"Connection error: {str(e)}"
+    except TimeoutError as e:
+        return None, str(e)
+    except Exception as e:
+        return None, f"Unexpected error: {str(e)}"
+
+
+def iter_sse(response):
+    """Yield (event, data) pairs from a Server-Sent Events response."""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:") :].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:") :].strip())
+
+
+def stream_prescription(text, placeholder):
+    """Extract text through the streaming endpoint, drawing fields as they arrive."""
+    try:
+        with get_session().post(
+            f"{backend_url}/process_text/stream",
+            json={"text": text},
+            stream=True,
+            timeout=(10, extraction_timeout),
+        ) as response:
+            if response.status_code != 200:
+                return None, f"Error: {response.status_code} - {response.text}"
+
+            for event, data in iter_sse(response):
+                payload = json.loads(data)
+                if event == "partial":
+                    with placeholder.container():
+                        display_prescription_card(payload)
+                elif event == "result":
+                    fetch_prescription_stats.clear()
+                    st.session_state.current_prescription = payload
+                    return payload, None
+                elif event == "error":
+                    return None, f"Error: {payload['status']} - {payload['detail']}"
+
+        return None, "Error: the extraction stream ended without a result"
+
     except requests.RequestException as e:
         return None, f"Connection error: {str(e)}"
     except Exception as e:
@@ -110,7 +214,10 @@ def process_prescription(text):
 
 
 def display_prescription_card(prescription):
-    """Display a formatted prescription card."""
+    """Display a formatted prescription card.
+
+    Fields may be missing while an extraction is still streaming in.
+    """
     with st.container():
         st.markdown('<div class="prescription-card">', unsafe_allow_html=True)
 
@@ -118,40 +225,40 @@ def display_prescription_card(prescription):
         col1, col2 = st.columns([3, 1])
         with col1:
             st.markdown(
-                f"<h3>Patient: {prescription['patient_name']}</h3>",
+                f"<h3>Patient: {prescription.get('patient_name')}</h3>",
                 unsafe_allow_html=True,
             )
-            if prescription["patient_dob"]:
-                st.markdown(f"DOB: {prescription['patient_dob']}")
+            if prescription.get("patient_dob"):
+                st.markdown(f"DOB: {prescription.get('patient_dob')}")
         with col2:
-            st.markdown(f"Date: {prescription['date_written']}")
-            if prescription["rx_number"]:
-                st.markdown(f"Rx #: {prescription['rx_number']}")
+            st.markdown(f"Date: {prescription.get('date_written')}")
+            if prescription.get("rx_number"):
+                st.markdown(f"Rx #: {prescription.get('rx_number')}")
 
         st.divider()
 
         # Medication details
         st.markdown("<h4>Medication</h4>", unsafe_allow_html=True)
-        medication = prescription["medication"]
+        medication = prescription.get("medication") or {}
 
         col1, col2 = st.columns(2)
         with col1:
             st.markdown(
-                f"<span class='highlight'>{medication['name']}</span> {medication['strength']}, {medication['form']}",
+                f"<span class='highlight'>{medication.get('name')}</span> {medication.get('strength')}, {medication.get('form')}",
                 unsafe_allow_html=True,
             )
         with col2:
-            st.markdown(f"Quantity: {medication['quantity']}")
+            st.markdown(f"Quantity: {medication.get('quantity')}")
 
         # Dosage instructions
-        dosage = prescription["dosage"]
-        st.markdown(f"<b>Sig:</b> {dosage['frequency']}", unsafe_allow_html=True)
+        dosage = prescription.get("dosage") or {}
+        st.markdown(f"<b>Sig:</b> {dosage.get('frequency')}", unsafe_allow_html=True)
 
-        if dosage["duration"]:
-            st.markdown(f"Duration: {dosage['duration']}")
-        if dosage["special_instructions"]:
+        if dosage.get("duration"):
+            st.markdown(f"Duration: {dosage.get('duration')}")
+        if dosage.get("special_instructions"):
             st.markdown(
-                f"<i>{dosage['special_instructions']}</i>", unsafe_allow_html=True
+                f"<i>{dosage.get('special_instructions')}</i>", unsafe_allow_html=True
             )
 
         st.divider()
@@ -160,50 +267,39 @@ def display_prescription_card(prescription):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown(
-                f"<b>Prescriber:</b> {prescription['prescriber_name']}",
+                f"<b>Prescriber:</b> {prescription.get('prescriber_name')}",
                 unsafe_allow_html=True,
             )
-            if prescription["prescriber_id"]:
-                st.markdown(f"ID: {prescription['prescriber_id']}")
+            if prescription.get("prescriber_id"):
+                st.markdown(f"ID: {prescription.get('prescriber_id')}")
         with col2:
             st.markdown(
-                f"<b>Refills:</b> {prescription['refills']}", unsafe_allow_html=True
+                f"<b>Refills:</b> {prescription.get('refills')}", unsafe_allow_html=True
             )
-            if prescription["is_controlled_substance"]:
+            if prescription.get("is_controlled_substance"):
                 st.markdown("⚠️ **CONTROLLED SUBSTANCE**", unsafe_allow_html=True)
 
         # Notes if present
-        if prescription["notes"]:
+        if prescription.get("notes"):
             st.divider()
             st.markdown(
-                f"<i>Notes: {prescription['notes']}</i>", unsafe_allow_html=True
+                f"<i>Notes: {prescription.get('notes')}</i>", unsafe_allow_html=True
             )
 
         st.markdown("</div>", unsafe_allow_html=True)
 
 
-def display_history_chart():
-    """Display a chart of prescription history."""
-    if not st.session_state.prescription_history:
-        return
+@st.cache_data(ttl=stats_ttl, show_spinner=False)
+def fetch_prescription_stats():
+    """Fetch aggregated prescription stats, cached for ``STATS_TTL`` seconds."""
+    response = get_session().get(f"{backend_url}/stats/prescriptions", timeout=10)
+    response.raise_for_status()
+    return response.json()
 
-    # Extract data for visualization
-    data = []
-    for entry in st.session_state.prescription_history:
-        rx = entry["data"]
-        data.append(
-            {
-                "timestamp": entry["timestamp"],
-                "patient": rx["patient_name"],
-                "medication": rx["medication"]["name"],
-                "is_controlled": rx["is_controlled_substance"],
-            }
-        )
-
-    df = pd.DataFrame(data)
 
-    # Simple bar chart of medications
-    med_counts = df["medication"].value_counts().reset_index()
+def display_history_chart(stats):
+    """Display charts of the stored prescriptions."""
+    med_counts = pd.DataFrame(stats["by_medication"], columns=["name", "count"])
     med_counts.columns = ["Medication", "Count"]
 
     chart = (
@@ -219,18 +315,164 @@ def display_history_chart():
 
     st.altair_chart(chart, use_container_width=True)
 
+    if stats["per_day"]:
+        daily = pd.DataFrame(stats["per_day"], columns=["day", "count"])
+        daily.columns = ["Day", "Count"]
+        chart = (
+            alt.Chart(daily)
+            .mark_bar()
+            .encode(x="Day:T", y="Count")
+            .properties(title="Prescriptions per Day", height=200)
+        )
+        st.altair_chart(chart, use_container_width=True)
+
+
+def read_uploaded_texts(files):
+    """Return (source, text) pairs from uploaded .txt, .zip and .csv files.
+
+    ZIP archives contribute each .txt file they hold, and CSV files each row
+    of their ``text`` column, or of the first column when there is none.
+    """
+    texts = []
+    for file in files:
+        name = file.name
+        data = file.getvalue()
+        if name.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for member in archive.namelist():
+                    if member.lower().endswith(".txt"):
+                        text = archive.read(member).decode("utf-8", errors="replace")
+                        texts.append((f"{name}/{member}", text))
+        elif name.lower().endswith(".csv"):
+            content = data.decode("utf-8-sig", errors="replace")
+            rows = list(csv.reader(io.StringIO(content)))
+            column, first_row = 0, 1
+            if rows and "text" in rows[0]:
+                column, first_row = rows[0].index("text"), 2
+                rows = rows[1:]
+            for number, row in enumerate(rows, start=first_row):
+                if len(row) > column:
+                    texts.append((f"{name}:{number}", row[column]))
+        else:
+            texts.append((name, data.decode("utf-8", errors="replace")))
+    return [(source, text) for source, text in texts if text.strip()]
+
+
+def submit_batch(texts):
+    """Extract and store texts with one /process_batch/ request."""
+    response = get_session().post(
+        f"{backend_url}/process_batch/",
+        json={"texts": texts},
+        timeout=extraction_timeout,
+    )
+    response.raise_for_status()
+    return response.json()["results"]
+
+
+def process_uploads(items, progress):
+    """Submit texts in batches, several at a time, reporting per-text results."""
+    results = {}
+    done = 0
+    with ThreadPoolExecutor(max_workers=upload_concurrency) as executor:
+        futures = {
+            executor.submit(
+                submit_batch,
+                [text for _, text in items[start : start + upload_batch_size]],
+            ): start
+            for start in range(0, len(items), upload_batch_size)
+        }
+        for future in as_completed(futures):
+            start = futures[future]
+            batch = items[start : start + upload_batch_size]
+            try:
+                outcomes = future.result()
+            except (KeyError, ValueError) as e:
+                # Checked first: requests' JSON decode errors are both
+                error = f"Invalid response from backend: {str(e)}"
+                outcomes = [{"status": "error", "error": error}] * len(batch)
+            except requests.RequestException as e:
+                error = f"Connection error: {str(e)}"
+                outcomes = [{"status": "error", "error": error}] * len(batch)
+
+            if len(outcomes) < len(batch):
+                error = "No result returned by backend"
+                missing = len(batch) - len(outcomes)
+                outcomes = outcomes + [{"status": "error", "error": error}] * missing
+
+            for i, ((source, _), outcome) in enumerate(zip(batch, outcomes), start):
+                data = outcome.get("data") or {}
+                results[i] = {
+                    "File": source,
+                    "Status": outcome["status"],
+                    "Patient": data.get("patient_name"),
+                    "Medication": (data.get("medication") or {}).get("name"),
+                    "Error": outcome.get("error"),
+                }
+
+            done += len(batch)
+            progress.progress(
+                done / len(items), text=f"Processed {done} of {len(items)} texts"
+            )
+
+    # Keep the table in upload order regardless of completion order
+    return [results[i] for i in sorted(results)]
+
+
+def display_bulk_upload(backend_status):
+    """Upload many prescription texts and process them in batches."""
+    st.markdown(
+        '<p class="sub-header">Upload Prescriptions</p>', unsafe_allow_html=True
+    )
+    files = st.file_uploader(
+        "Text files, ZIP archives of text files, or CSV files with a text column:",
+        type=["txt", "zip", "csv"],
+        accept_multiple_files=True,
+    )
+
+    if st.button(
+        "Extract All",
+        type="primary",
+        disabled=not files or backend_status is False,
+    ):
+        try:
+            items = read_uploaded_texts(files)
+        except (zipfile.BadZipFile, csv.Error) as e:
+            st.markdown(
+                f'<div class="error-msg">Could not read upload: {str(e)}</div>',
+                unsafe_allow_html=True,
+            )
+            return
+        if not items:
+            st.warning("No prescription texts found in the uploaded files.")
+            return
+
+        progress = st.progress(0.0, text=f"Processed 0 of {len(items)} texts")
+        st.session_state.upload_results = process_uploads(items, progress)
+        fetch_prescription_stats.clear()
+
+    results = st.session_state.get("upload_results")
+    if results:
+        succeeded = sum(result["Status"] == "success" for result in results)
+        if succeeded == len(results):
+            st.success(f"Extracted all {len(results)} prescriptions")
+        else:
+            st.warning(f"Extracted {succeeded} of {len(results)} prescriptions")
+        st.dataframe(pd.DataFrame(results), use_container_width=True)
+
 
 def main():
-    # Check backend health
-    st.session_state.backend_status = check_backend_health()
+    # Last result of the background health check
+    backend_status = get_health_monitor().healthy
 
     # Sidebar
     with st.sidebar:
         st.markdown('<p class="sub-header">Configuration</p>', unsafe_allow_html=True)
 
         # Backend status indicator
-        if st.session_state.backend_status:
+        if backend_status:
             st.success("Backend API: Connected")
+        elif backend_status is None:
+            st.info("Backend API: Checking connection...")
         else:
             st.error("Backend API: Disconnected")
             st.warning(f"Attempting to connect to: {backend_url}")
@@ -239,17 +481,23 @@ def main():
 
         # History section
         st.markdown('<p class="sub-header">History</p>', unsafe_allow_html=True)
-        if st.session_state.prescription_history:
-            history_count = len(st.session_state.prescription_history)
-            st.info(f"{history_count} prescriptions processed")
-
-            if st.button("Clear History"):
-                st.session_state.prescription_history = []
-                st.session_state.current_prescription = None
+        try:
+            stats = fetch_prescription_stats()
+        except requests.RequestException:
+            stats = None
+
+        if stats is None:
+            st.warning("History is unavailable")
+        elif stats["total"]:
+            st.info(f"{stats['total']} prescriptions processed")
+            st.metric("Controlled substances", f"{stats['controlled_ratio']:.0%}")
+
+            if st.button("Refresh History"):
+                fetch_prescription_stats.clear()
                 st.rerun()
 
             # Show history visualization
-            display_history_chart()
+            display_history_chart(stats)
         else:
             st.info("No prescriptions processed yet")
 
@@ -259,6 +507,11 @@ def main():
     )
     st.markdown("Extract structured data from prescription text using AI")
 
+    mode = st.radio("Input", ["Paste Text", "Upload Files"], horizontal=True)
+    if mode == "Upload Files":
+        display_bulk_upload(backend_status)
+        return
+
     # Prescription input
     st.markdown(
         '<p class="sub-header">Enter Prescription Text</p>', unsafe_allow_html=True
@@ -298,7 +551,7 @@ def main():
     process_col, clear_col = st.columns([1, 4])
     with process_col:
         process_button = st.button(
-            "Extract Data", type="primary", disabled=not st.session_state.backend_status
+            "Extract Data", type="primary", disabled=backend_status is False
         )
     with clear_col:
         if st.button("Clear"):
@@ -310,15 +563,22 @@ def main():
         if not input_text:
             st.warning("Please enter prescription text.")
         else:
-            with st.spinner("Processing prescription..."):
-                prescription_data, error = process_prescription(input_text)
-
-                if error:
-                    st.markdown(
-                        f'<div class="error-msg">{error}</div>', unsafe_allow_html=True
-                    )
-                elif prescription_data:
-                    st.success("Prescription data extracted successfully!")
+            if stream_extraction:
+                placeholder = st.empty()
+                prescription_data, error = stream_prescription(
+                    input_text, placeholder
+                )
+                placeholder.empty()
+            else:
+                with st.spinner("Processing prescription..."):
+                    prescription_data, error = process_prescription(input_text)
+
+            if error:
+                st.markdown(
+                    f'<div class="error-msg">{error}</div>', unsafe_allow_html=True
+                )
+            elif prescription_data:
+                st.success("Prescription data extracted successfully!")
 
     # Display current prescription if available
     if st.session_state.current_prescription: